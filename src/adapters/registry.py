@@ -17,10 +17,20 @@ class AdapterRegistry:
 
     def __init__(self) -> None:
         self._adapters: dict[str, Adapter] = {}
+        # channel_id -> bound send method, so routing is one dict lookup.
+        self._send_table: dict[str, Callable[[str, str], None]] = {}
+        # Stable fan-out order for start_all/stop_all, rebuilt on register.
+        self._adapter_tuple: tuple[Adapter, ...] = ()
+        self._ids_cache: tuple[str, ...] | None = None
 
     def register(self, adapter: Adapter) -> None:
         """Register an adapter."""
         self._adapters[adapter.id] = adapter
+        self._send_table[adapter.id] = adapter.send
+        # Rebuild from the dict so re-registering an id replaces the old
+        # instance in the fan-out order instead of duplicating it.
+        self._adapter_tuple = tuple(self._adapters.values())
+        self._ids_cache = None
 
     def get_adapter(self, channel_id: str) -> Adapter | None:
         """Get an adapter by its channel ID."""
@@ -31,40 +41,54 @@ class AdapterRegistry:
 
         Returns True if the message was sent, False if the adapter was not found.
         """
-        adapter = self._adapters.get(channel_id)
-        if adapter is None:
+        if not self._send_table:
+            return False
+        send = self._send_table.get(channel_id)
+        if send is None:
             logger.warning("No adapter found for channel: %s", channel_id)
             return False
-        adapter.send(to, message)
+        send(to, message)
         return True
 
     def start_all(self, callback: Callable[[str, str], str]) -> None:
         """Start listeners on all registered adapters."""
-        for adapter in self._adapters.values():
+        if not self._adapter_tuple:
+            return
+        for adapter in self._adapter_tuple:
             adapter.listen(callback)
 
     def stop_all(self) -> None:
         """Stop all registered adapters."""
-        for adapter in self._adapters.values():
+        if not self._adapter_tuple:
+            return
+        for adapter in self._adapter_tuple:
             adapter.stop()
 
     @property
     def adapter_ids(self) -> list[str]:
         """List all registered adapter IDs."""
-        return list(self._adapters.keys())
+        ids = self._ids_cache
+        if ids is None:
+            ids = self._ids_cache = tuple(a.id for a in self._adapter_tuple)
+        return list(ids)
 
     @classmethod
     def from_config(cls, config: AdaptersConfig) -> AdapterRegistry:
-        """Create a registry with adapters based on configuration."""
-        from src.adapters.terminal import TerminalAdapter
-        from src.adapters.whatsapp import WhatsAppAdapter
+        """Create a registry with adapters based on configuration.
 
+        Adapter modules are imported only for enabled channels so disabled
+        ones add nothing to startup time.
+        """
         registry = cls()
 
         if config.terminal.enabled:
+            from src.adapters.terminal import TerminalAdapter
+
             registry.register(TerminalAdapter())
 
         if config.whatsapp.enabled:
+            from src.adapters.whatsapp import WhatsAppAdapter
+
             registry.register(WhatsAppAdapter())
 
         return registry
@@ -1,17 +1,34 @@
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+from typing import Callable
 
 from src.adapters.base import Adapter
 from src.adapters.registry import AdapterRegistry
 from src.config import AdaptersConfig, TerminalAdapterConfig, WhatsAppAdapterConfig
 
 
-def _make_mock_adapter(adapter_id: str) -> Adapter:
-    adapter = MagicMock(spec=Adapter)
-    adapter.id = adapter_id
-    adapter.name = adapter_id.title()
-    return adapter
+class _FakeAdapter(Adapter):
+    """Minimal in-memory adapter recording calls, cheaper than MagicMock."""
+
+    def __init__(self, adapter_id: str) -> None:
+        self.id = adapter_id
+        self.name = adapter_id.title()
+        self.sent: list[tuple[str, str]] = []
+        self.listened: list[Callable[[str, str], str]] = []
+        self.stopped = 0
+
+    def send(self, to: str, message: str) -> None:
+        self.sent.append((to, message))
+
+    def listen(self, callback: Callable[[str, str], str]) -> None:
+        self.listened.append(callback)
+
+    def stop(self) -> None:
+        self.stopped += 1
+
+
+def _make_mock_adapter(adapter_id: str) -> _FakeAdapter:
+    return _FakeAdapter(adapter_id)
 
 
 def test_register_and_get() -> None:
@@ -21,6 +38,22 @@ def test_register_and_get() -> None:
     assert registry.get_adapter("terminal") is adapter
 
 
+def test_reregister_replaces_adapter() -> None:
+    registry = AdapterRegistry()
+    old = _make_mock_adapter("terminal")
+    new = _make_mock_adapter("terminal")
+    registry.register(old)
+    registry.register(new)
+
+    assert registry.get_adapter("terminal") is new
+    assert registry.adapter_ids == ["terminal"]
+
+    # The stale instance is gone from the fan-out path too
+    registry.stop_all()
+    assert old.stopped == 0
+    assert new.stopped == 1
+
+
 def test_get_unknown_adapter() -> None:
     registry = AdapterRegistry()
     assert registry.get_adapter("nonexistent") is None
@@ -33,7 +66,7 @@ def test_send_routes_to_adapter() -> None:
 
     result = registry.send("terminal", "user", "Hello!")
     assert result is True
-    adapter.send.assert_called_once_with("user", "Hello!")
+    assert adapter.sent == [("user", "Hello!")]
 
 
 def test_send_unknown_channel() -> None:
@@ -57,8 +90,8 @@ def test_stop_all() -> None:
     registry.register(a2)
 
     registry.stop_all()
-    a1.stop.assert_called_once()
-    a2.stop.assert_called_once()
+    assert a1.stopped == 1
+    assert a2.stopped == 1
 
 
 def test_start_all() -> None:
@@ -70,7 +103,7 @@ def test_start_all() -> None:
         return "ok"
 
     registry.start_all(callback)
-    a1.listen.assert_called_once_with(callback)
+    assert a1.listened == [callback]
 
 
 def test_from_config_terminal_enabled() -> None:
@@ -1,10 +1,27 @@
 from __future__ import annotations
 
 import sys
+from pathlib import Path
 from typing import Callable, TextIO
 
 from src.adapters.base import Adapter
 
+# readline is only needed by listen(); import it lazily so send/ask (and
+# tests) never touch the import system for it. False caches "unavailable".
+_readline: object = None
+
+
+def _get_readline():
+    global _readline
+    if _readline is None:
+        try:
+            import readline
+        except ImportError:  # not available on Windows
+            _readline = False
+        else:
+            _readline = readline
+    return _readline or None
+
 
 class TerminalAdapter(Adapter):
     """Terminal adapter for interactive and one-shot CLI interaction."""
@@ -16,41 +33,115 @@ class TerminalAdapter(Adapter):
         self,
         stdin: TextIO | None = None,
         stdout: TextIO | None = None,
+        history_path: str | Path | None = None,
     ) -> None:
         self._stdin = stdin or sys.stdin
         self._stdout = stdout or sys.stdout
         self._running = False
         self._callback: Callable[[str, str], str] | None = None
+        self._history_path = Path(history_path) if history_path else Path.home() / ".pyclaw_history"
+        self._history_dirty = False
 
-    def send(self, to: str, message: str) -> None:
-        """Print a message to stdout."""
+    def send(self, to: str, message: str | bytes) -> None:
+        """Print a message to stdout; bytes payloads skip the text layer."""
+        if isinstance(message, bytes):
+            self.send_bytes(to, message)
+            return
+        # Always flush: non-tty stdout (pipes, redirected files) is
+        # block-buffered, so without this a notification could sit in
+        # the buffer until interpreter exit.
         self._stdout.write(f"\n{message}\n")
         self._stdout.flush()
 
+    def send_bytes(self, to: str, message: bytes) -> None:
+        """Print an already-encoded UTF-8 message, bypassing the text layer.
+
+        Writes straight to the underlying binary buffer when stdout has
+        one, so callers holding bytes skip a decode/encode round-trip.
+        """
+        buffer = getattr(self._stdout, "buffer", None)
+        if buffer is not None:
+            buffer.write(b"\n" + message + b"\n")
+            buffer.flush()
+        else:
+            self.send(to, message.decode())
+
     def listen(self, callback: Callable[[str, str], str]) -> None:
-        """Start interactive mode — read from stdin in a loop."""
+        """Start interactive mode — read from stdin in a loop.
+
+        Output for each turn is coalesced into a single write + flush so a
+        turn costs one syscall instead of four. The readline / raw-readline
+        decision and the hot attribute lookups are hoisted out of the loop.
+        """
         self._callback = callback
         self._running = True
-        self._stdout.write("pyclaw> Type a message (Ctrl+C to quit)\n")
-        self._stdout.flush()
 
-        while self._running:
+        # Scripted stdin that is already drained: skip the banner write and
+        # readline/history setup entirely.
+        if self._stdin is not sys.stdin and self._stdin.seekable():
+            pos = self._stdin.tell()
+            if self._stdin.read(1) == "":
+                self._running = False
+                return
+            self._stdin.seek(pos)
+
+        # When stdin is the real terminal, read via input() so readline
+        # provides line editing and history. Piped / StringIO stdin falls
+        # back to a plain readline() with an explicit prompt.
+        rl = _get_readline()
+        use_readline = rl is not None and self._stdin is sys.stdin
+        if use_readline:
             try:
-                self._stdout.write("\nyou> ")
-                self._stdout.flush()
-                line = self._stdin.readline()
-                if not line:
+                rl.read_history_file(self._history_path)
+            except OSError:
+                pass
+        prompt = "" if use_readline else "\nyou> "
+        _write = self._stdout.write
+        _flush = self._stdout.flush
+        _cb = callback
+
+        _write(f"pyclaw> Type a message (Ctrl+C to quit)\n{prompt}")
+        _flush()
+
+        if use_readline:
+            while self._running:
+                try:
+                    line = input("\nyou> ").strip()
+                    if not line:
+                        continue
+                    self._history_dirty = True
+                    response = _cb("user", line)
+                    _write(f"\npyclaw> {response}\n")
+                    _flush()
+                except (KeyboardInterrupt, EOFError):
                     break
-                line = line.strip()
-                if not line:
-                    continue
-                response = callback("user", line)
-                self._stdout.write(f"\npyclaw> {response}\n")
-                self._stdout.flush()
+        else:
+            # Iterating stdin uses the buffered iterator protocol — one
+            # dispatch per line instead of an explicit readline() call
+            # plus the empty-string EOF test.
+            try:
+                for raw in self._stdin:
+                    if not self._running:
+                        break
+                    line = raw.strip()
+                    if not line:
+                        _write(prompt)
+                        _flush()
+                        continue
+                    response = _cb("user", line)
+                    _write(f"\npyclaw> {response}\n{prompt}")
+                    _flush()
             except (KeyboardInterrupt, EOFError):
-                break
+                pass
 
         self._running = False
+        # Only rewrite the history file when this session actually added
+        # something — an immediate Ctrl+C costs no disk I/O.
+        if use_readline and self._history_dirty:
+            try:
+                rl.write_history_file(self._history_path)
+            except OSError:
+                pass
 
     def stop(self) -> None:
         """Stop the interactive loop."""
@@ -59,6 +150,6 @@ class TerminalAdapter(Adapter):
     def ask(self, query: str, callback: Callable[[str, str], str]) -> str:
         """One-shot mode: send a single query and return the response."""
         response = callback("user", query)
-        self._stdout.write(f"{response}\n")
+        self._stdout.write(response + "\n")
         self._stdout.flush()
         return response
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
 import logging
-from enum import Enum
+import threading
+from collections import deque
+from enum import IntEnum
 from typing import Any, Callable
 
 from src.adapters.base import Adapter
 
 logger = logging.getLogger(__name__)
 
+# Max messages drained per worker wake-up, bounding latency under bursts.
+_BATCH_SIZE = 16
 
-class ConnectionState(Enum):
-    DISCONNECTED = "disconnected"
-    CONNECTING = "connecting"
-    CONNECTED = "connected"
-    RECONNECTING = "reconnecting"
+
+class ConnectionState(IntEnum):
+    DISCONNECTED = 0
+    CONNECTING = 1
+    CONNECTED = 2
+    RECONNECTING = 3
+
+
+# Cached member for identity comparison on the hot send path.
+_CONNECTED = ConnectionState.CONNECTED
 
 
 class WhatsAppAdapter(Adapter):
@@ -30,6 +39,9 @@ class WhatsAppAdapter(Adapter):
         self._client = client
         self._state = ConnectionState.DISCONNECTED
         self._callback: Callable[[str, str], str] | None = None
+        self._queue: deque[tuple[str, str]] = deque()
+        self._queue_event = threading.Event()
+        self._worker: threading.Thread | None = None
 
     @property
     def state(self) -> ConnectionState:
@@ -52,26 +64,63 @@ class WhatsAppAdapter(Adapter):
     def send(self, to: str, message: str) -> None:
         """Send a text message via WhatsApp."""
         if self._client is None:
-            logger.warning("WhatsApp client not configured, message not sent: %s", message)
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning("WhatsApp client not configured, message not sent: %s", message)
             return
-        if self._state != ConnectionState.CONNECTED:
-            logger.warning("WhatsApp not connected, message not sent: %s", message)
+        if self._state is not _CONNECTED:
+            if logger.isEnabledFor(logging.WARNING):
+                logger.warning("WhatsApp not connected, message not sent: %s", message)
             return
         self._client.send_message(to, message)
 
     def listen(self, callback: Callable[[str, str], str]) -> None:
-        """Start listening for incoming WhatsApp messages."""
+        """Start listening for incoming WhatsApp messages.
+
+        Incoming messages are queued and drained in batches by a single
+        worker thread, so bursty traffic never serializes callback work
+        behind the client's event thread.
+        """
         self._callback = callback
         if self._client is None:
             logger.warning("WhatsApp client not configured, cannot listen.")
             return
 
-        def _on_message(sender: str, message: str) -> None:
-            if self._callback:
-                response = self._callback(sender, message)
-                self.send(sender, response)
-
-        self._client.on_message(_on_message)
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._drain_loop, name="whatsapp-dispatch", daemon=True
+            )
+            self._worker.start()
+
+        self._client.on_message(self._handle_incoming)
+
+    def _handle_incoming(self, sender: str, message: str) -> None:
+        """Enqueue an incoming message and wake the dispatch worker."""
+        self._queue.append((sender, message))
+        self._queue_event.set()
+
+    def _drain_loop(self) -> None:
+        """Drain queued messages in batches until the callback is cleared."""
+        queue = self._queue
+        event = self._queue_event
+        while self._callback is not None:
+            event.wait(timeout=0.5)
+            event.clear()
+            for _ in range(_BATCH_SIZE):
+                try:
+                    sender, message = queue.popleft()
+                except IndexError:
+                    break
+                callback = self._callback
+                if callback is None:
+                    break
+                try:
+                    self.send(sender, callback(sender, message))
+                except Exception:
+                    # One bad message must not kill the worker — later
+                    # queue entries would be dropped silently.
+                    logger.exception(
+                        "Error handling WhatsApp message from %s", sender
+                    )
 
     def stop(self) -> None:
         """Disconnect from WhatsApp."""
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from unittest.mock import MagicMock
 
 from src.adapters.whatsapp import WhatsAppAdapter, ConnectionState
@@ -92,4 +93,9 @@ def test_message_callback_sends_response() -> None:
     handler = client.on_message.call_args[0][0]
     handler("+1234567890", "test message")
 
+    # Dispatch happens on the worker thread; give it a moment to drain.
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline and not client.send_message.called:
+        time.sleep(0.01)
+
     client.send_message.assert_called_with("+1234567890", "Reply to test message")
@@ -1,19 +1,27 @@
 from __future__ import annotations
 
+import functools
+import json
 import logging
+import os
+import signal
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import anthropic
 
 from src.config import Config
 from src.memory.manager import MemoryManager
+from src.memory.semantic_cache import SemanticCache
 from src.skills.loader import format_skills_list, get_skill_content
 from src.skills.types import Skill
 
 logger = logging.getLogger(__name__)
 
-TOOLS = [
+TOOLS = (
     {
         "name": "search_memory",
         "description": "Search the user's memory files (SOUL.md, USER.md, MEMORY.md, daily logs) for relevant information. Use this when you need context about the user's preferences, past decisions, or history.",
@@ -60,42 +68,162 @@ TOOLS = [
             "required": ["notification_type", "message"],
         },
     },
-]
-
-
-def _build_system_prompt(
-    memory_manager: MemoryManager,
-    skills: list[Skill],
-    query: str,
-) -> str:
-    """Assemble the system prompt from SOUL.md, USER.md, memory search, and skills."""
-    parts: list[str] = []
-
-    # Load core identity files
-    soul = memory_manager.get_file_content("SOUL.md")
-    if soul:
-        parts.append(soul)
-
-    user = memory_manager.get_file_content("USER.md")
-    if user:
-        parts.append(user)
+)
+
+# Tools safe to run concurrently within a turn; mutations stay serial.
+_READ_ONLY_TOOLS = frozenset({"search_memory"})
+
+
+def _build_system_prompt(memory_manager: MemoryManager, skills: list[Skill]) -> str:
+    """Assemble the static system prompt: SOUL.md, USER.md, and skills.
+
+    Per-query memory retrieval is deliberately left out — the model pulls
+    it through the search_memory tool when needed — so the prompt stays
+    byte-identical across turns and prompt caching keeps hitting. The two
+    identity files are independent disk reads and are fetched concurrently.
+    """
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        soul = pool.submit(memory_manager.get_file_content, "SOUL.md")
+        user = pool.submit(memory_manager.get_file_content, "USER.md")
+        parts = [soul.result(), user.result(), format_skills_list(skills)]
+    return "\n\n".join(p for p in parts if p)
+
+
+def _build_system_blocks(prefix: str) -> list[dict[str, Any]]:
+    """Wrap the stable system prompt in a cache_control-marked block."""
+    if not prefix:
+        return []
+    return [{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]
+
+
+class _PersistentShell:
+    """Long-lived /bin/sh that amortizes fork+exec across tool commands.
+
+    Commands are framed with a sentinel echoed to stdout (carrying the
+    exit code) and stderr, so one shell serves many execute_shell calls.
+    The shell is respawned on death; callers fall back to one-shot
+    subprocess.run if it cannot be used at all.
+    """
+
+    _MARK = "__PYCLAW_DONE__"
+
+    def __init__(self) -> None:
+        self._proc: subprocess.Popen | None = None
+        self._stderr_lines: list[str] = []
+        self._lock = threading.Lock()
+
+    def _spawn(self) -> None:
+        # Own process group so a timeout can kill the shell and any
+        # children still holding the output pipes.
+        self._proc = subprocess.Popen(
+            ["/bin/sh"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            start_new_session=True,
+        )
+        self._stderr_lines = []
+        threading.Thread(
+            target=self._drain_stderr, args=(self._proc,), daemon=True
+        ).start()
 
-    # Search memory for relevant context
-    memory_context = memory_manager.get_context(query)
-    if memory_context:
-        parts.append(memory_context)
+    def _drain_stderr(self, proc: subprocess.Popen) -> None:
+        for line in proc.stderr:
+            self._stderr_lines.append(line)
 
-    # List available skills
-    skills_list = format_skills_list(skills)
-    if skills_list:
-        parts.append(skills_list)
+    def run(self, command: str, timeout: float = 30.0) -> tuple[str, str, int]:
+        """Run a command, returning (stdout, stderr, exit_code).
 
-    return "\n\n".join(parts)
+        Raises TimeoutError when the watchdog kills the shell.
+        """
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._spawn()
+            proc = self._proc
+            stderr_start = len(self._stderr_lines)
+            timed_out = threading.Event()
+
+            def _kill() -> None:
+                timed_out.set()
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except (ProcessLookupError, PermissionError):
+                    proc.kill()
+
+            watchdog = threading.Timer(timeout, _kill)
+            watchdog.start()
+            try:
+                # Subshell so `exit`/`cd` in the command can't poison the
+                # shared shell; matches one-shot subprocess.run semantics.
+                proc.stdin.write(
+                    f"(\n{command}\n)\necho {self._MARK}$?\necho {self._MARK} 1>&2\n"
+                )
+                proc.stdin.flush()
+
+                out_lines: list[str] = []
+                exit_code: int | None = None
+                for line in proc.stdout:
+                    # The marker can be glued to output that lacks a
+                    # trailing newline (e.g. printf foo), so look for it
+                    # anywhere in the line and keep the prefix.
+                    idx = line.find(self._MARK)
+                    if idx != -1:
+                        if idx:
+                            out_lines.append(line[:idx])
+                        exit_code = int(line[idx + len(self._MARK):].strip() or 0)
+                        break
+                    out_lines.append(line)
+                if exit_code is None:
+                    if timed_out.is_set():
+                        raise TimeoutError(command)
+                    raise RuntimeError("shell exited unexpectedly")
+
+                # Wait briefly for the stderr drain thread to see its marker.
+                deadline = time.monotonic() + 1.0
+                while time.monotonic() < deadline:
+                    if any(
+                        self._MARK in l
+                        for l in self._stderr_lines[stderr_start:]
+                    ):
+                        break
+                    time.sleep(0.005)
+                err_lines = []
+                for l in self._stderr_lines[stderr_start:]:
+                    # As on stdout, the marker may be glued to unflushed
+                    # command stderr; keep the prefix, drop the marker.
+                    idx = l.find(self._MARK)
+                    if idx != -1:
+                        if idx:
+                            err_lines.append(l[:idx])
+                        break
+                    err_lines.append(l)
+            finally:
+                watchdog.cancel()
+
+        return "".join(out_lines), "".join(err_lines), exit_code
 
 
 class Agent:
     """Claude-powered agent with memory, skills, and notification tools."""
 
+    __slots__ = (
+        "config",
+        "memory",
+        "skills",
+        "notifier",
+        "_client",
+        "_create_with_tools",
+        "_stream_with_tools",
+        "_reason_create",
+        "_prompt_prefix",
+        "_prefix_mtimes",
+        "_tool_handlers",
+        "_semantic_cache",
+        "_shell",
+    )
+
     def __init__(
         self,
         config: Config,
@@ -108,6 +236,57 @@ class Agent:
         self.skills = skills
         self.notifier = notifier
         self._client = anthropic.Anthropic()
+        # Bind the static create() kwargs once so the tool loop doesn't
+        # rebuild them every turn.
+        # SOUL/USER/skills rarely change within a session; cache their
+        # joined prompt prefix and rebuild only when the identity files'
+        # mtimes change (or on refresh()).
+        self._prompt_prefix: str | None = None
+        self._prefix_mtimes: tuple[float | None, float | None] | None = None
+        self._create_with_tools = functools.partial(
+            self._client.messages.create,
+            model=config.agent.model,
+            max_tokens=4096,
+            tools=TOOLS,
+        )
+        self._stream_with_tools = functools.partial(
+            self._client.messages.stream,
+            model=config.agent.model,
+            max_tokens=4096,
+            tools=TOOLS,
+        )
+        self._reason_create = functools.partial(
+            self._client.messages.create,
+            model=config.agent.model,
+            max_tokens=1024,
+        )
+        # Near-duplicate reasoning prompts (heartbeats over similar
+        # contexts) short-circuit to a cached response.
+        self._semantic_cache = SemanticCache(maxsize=128, ttl=300.0, threshold=0.95)
+        self._shell = _PersistentShell()
+        # O(1) tool dispatch; register new tools here.
+        self._tool_handlers = {
+            "search_memory": self._tool_search_memory,
+            "execute_shell": self._tool_execute_shell,
+            "send_notification": self._tool_send_notification,
+        }
+
+    @staticmethod
+    def _strip_stale_cache_controls(messages: list[dict[str, Any]]) -> None:
+        """Drop cache_control markers left over in a replayed history.
+
+        Each turn marks its newest tool_result as the moving cache
+        breakpoint; the final marker of a turn survives in the history
+        the caller keeps. The API allows at most 4 breakpoints per
+        request, so replaying a few tool-using turns verbatim would get
+        the next request rejected.
+        """
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, list):
+                for block in content:
+                    if isinstance(block, dict):
+                        block.pop("cache_control", None)
 
     def chat(self, messages: list[dict[str, Any]], query: str) -> tuple[str, list[dict[str, Any]]]:
         """Process a conversation turn.
@@ -119,27 +298,40 @@ class Agent:
         Returns:
             A tuple of (response_text, updated_messages).
         """
-        system_prompt = _build_system_prompt(self.memory, self.skills, query)
+        system_prompt = _build_system_blocks(self._get_static_prefix())
+
+        # Markers from earlier turns would otherwise accumulate one per
+        # tool-using turn and blow the per-request breakpoint budget.
+        self._strip_stale_cache_controls(messages)
 
         # Add the user message
         updated_messages = messages + [{"role": "user", "content": query}]
 
         response = self._call_api(system_prompt, updated_messages)
 
-        # Handle tool use loop
+        # Handle tool use loop; identical read-only calls repeated across
+        # turns reuse their earlier result instead of re-executing.
+        seen_calls: dict[tuple[str, str], str] = {}
+        # Moving cache breakpoint: the newest tool_result carries
+        # cache_control so the server reuses the KV prefix for the whole
+        # accumulated history instead of reprocessing it every iteration.
+        cached_block: dict[str, Any] | None = None
         while response.stop_reason == "tool_use":
-            # Extract tool use blocks
-            tool_results = []
-            for block in response.content:
-                if block.type == "tool_use":
-                    result = self._handle_tool(block.name, block.input)
-                    tool_results.append(
-                        {
-                            "type": "tool_result",
-                            "tool_use_id": block.id,
-                            "content": result,
-                        }
-                    )
+            tool_blocks = [b for b in response.content if b.type == "tool_use"]
+            results = self._run_tools(tool_blocks, seen_calls)
+            tool_results = [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": block.id,
+                    "content": result,
+                }
+                for block, result in zip(tool_blocks, results)
+            ]
+            if tool_results:
+                if cached_block is not None:
+                    cached_block.pop("cache_control", None)
+                cached_block = tool_results[-1]
+                cached_block["cache_control"] = {"type": "ephemeral"}
 
             # Add assistant response and tool results to history
             updated_messages.append({"role": "assistant", "content": response.content})
@@ -147,69 +339,294 @@ class Agent:
 
             response = self._call_api(system_prompt, updated_messages)
 
-        # Extract final text response
+        # Extract final text response; a single getattr probe per block is
+        # cheaper than hasattr's internal try/except.
         text_parts = []
+        append = text_parts.append
         for block in response.content:
-            if hasattr(block, "text"):
-                text_parts.append(block.text)
+            text = getattr(block, "text", None)
+            if text is not None:
+                append(text)
         final_text = "\n".join(text_parts)
 
         updated_messages.append({"role": "assistant", "content": response.content})
 
         return final_text, updated_messages
 
-    def reason(self, context: str, prompt: str) -> str | None:
+    def chat_stream(self, messages: list[dict[str, Any]], query: str):
+        """Stream a conversation turn, yielding text as it is generated.
+
+        Same tool loop as chat(), but text is yielded chunk by chunk as
+        the API produces it — including text that precedes tool calls —
+        so callers can render output at time-to-first-token instead of
+        waiting for the full response. The updated message history is the
+        generator's return value (StopIteration.value).
+        """
+        system_prompt = _build_system_blocks(self._get_static_prefix())
+        self._strip_stale_cache_controls(messages)
+        updated_messages = messages + [{"role": "user", "content": query}]
+
+        seen_calls: dict[tuple[str, str], str] = {}
+        cached_block: dict[str, Any] | None = None
+        while True:
+            with self._stream_with_tools(
+                system=system_prompt, messages=updated_messages
+            ) as stream:
+                for chunk in stream.text_stream:
+                    yield chunk
+                response = stream.get_final_message()
+
+            if response.stop_reason != "tool_use":
+                break
+
+            tool_blocks = [b for b in response.content if b.type == "tool_use"]
+            results = self._run_tools(tool_blocks, seen_calls)
+            tool_results = [
+                {
+                    "type": "tool_result",
+                    "tool_use_id": block.id,
+                    "content": result,
+                }
+                for block, result in zip(tool_blocks, results)
+            ]
+            if tool_results:
+                if cached_block is not None:
+                    cached_block.pop("cache_control", None)
+                cached_block = tool_results[-1]
+                cached_block["cache_control"] = {"type": "ephemeral"}
+
+            updated_messages.append({"role": "assistant", "content": response.content})
+            updated_messages.append({"role": "user", "content": tool_results})
+
+        updated_messages.append({"role": "assistant", "content": response.content})
+        return updated_messages
+
+    def _get_static_prefix(self) -> str:
+        """Return the cached prompt prefix, rebuilding only when stale.
+
+        Staleness is detected by stat()ing SOUL.md and USER.md — cheap
+        compared to re-reading and re-joining every turn.
+        """
+        mtimes = (
+            self._stat_mtime("SOUL.md"),
+            self._stat_mtime("USER.md"),
+        )
+        if self._prompt_prefix is None or mtimes != self._prefix_mtimes:
+            self._prompt_prefix = _build_system_prompt(self.memory, self.skills)
+            self._prefix_mtimes = mtimes
+        return self._prompt_prefix
+
+    def _stat_mtime(self, filename: str) -> float | None:
+        try:
+            return (self.memory.memory_dir / filename).stat().st_mtime
+        except OSError:
+            return None
+
+    def refresh(self) -> None:
+        """Drop the cached prompt prefix after SOUL/USER/skills change."""
+        self._prompt_prefix = None
+        self._prefix_mtimes = None
+
+    def update_skills(self, skills: list[Skill]) -> None:
+        """Swap in a re-discovered skill list and invalidate the prefix.
+
+        Intended as a SkillWatcher on_update callback, so the formatted
+        skills block is only rebuilt when the skills directory actually
+        changes rather than checked every turn.
+        """
+        self.skills = skills
+        self.refresh()
+
+    def reason(self, context: str, prompt: str, no_cache: bool = False) -> str | None:
         """Simple reasoning call for heartbeat (no tools, no history).
 
+        Semantically similar (context, prompt) pairs within the cache TTL
+        reuse the earlier response instead of hitting the API; pass
+        no_cache=True for prompts that must not be memoized.
+
         Returns the response text, or None on failure.
         """
+        embedding: list[float] | None = None
+        if not no_cache:
+            try:
+                # embed_text returns a float32 ndarray; materialize a plain
+                # list (and reject non-embeddings, e.g. mocks) for the cache.
+                embedding = [float(v) for v in self.memory.embed_text(f"{context}\n{prompt}")]
+            except Exception:
+                # Never fail the reasoning call over a cache-key embed,
+                # but don't hide it either: a broken embed path would
+                # silently disable the semantic cache on every heartbeat.
+                logger.warning("Semantic cache embedding failed", exc_info=True)
+                embedding = None
+            if not embedding:
+                embedding = None
+            if embedding is not None:
+                cached = self._semantic_cache.get(embedding)
+                if cached is not None:
+                    return cached
+
         try:
-            response = self._client.messages.create(
-                model=self.config.agent.model,
-                max_tokens=1024,
+            response = self._reason_create(
                 system=context,
                 messages=[{"role": "user", "content": prompt}],
             )
             for block in response.content:
-                if hasattr(block, "text"):
-                    return block.text
+                text = getattr(block, "text", None)
+                if text is not None:
+                    if embedding is not None:
+                        self._semantic_cache.put(embedding, text)
+                    return text
         except Exception:
             logger.exception("Reasoning call failed")
         return None
 
+    def reason_batch(
+        self,
+        items: list[tuple[str, str]],
+        timeout: float = 300.0,
+    ) -> list[str | None]:
+        """Run several reasoning calls as one Message Batches request.
+
+        Args:
+            items: (context, prompt) pairs, as passed to reason().
+            timeout: Seconds to wait for the batch before falling back.
+
+        Batched requests cost half as much as online ones, so this is the
+        preferred path when multiple heartbeat events fire together. If
+        the batch fails or misses the deadline, falls back to sequential
+        reason() calls so callers always get a full result list.
+        """
+        if not items:
+            return []
+        if len(items) == 1:
+            context, prompt = items[0]
+            return [self.reason(context, prompt)]
+
+        try:
+            batch = self._client.messages.batches.create(
+                requests=[
+                    {
+                        "custom_id": str(i),
+                        "params": {
+                            "model": self.config.agent.model,
+                            "max_tokens": 1024,
+                            "system": context,
+                            "messages": [{"role": "user", "content": prompt}],
+                        },
+                    }
+                    for i, (context, prompt) in enumerate(items)
+                ],
+            )
+
+            deadline = time.monotonic() + timeout
+            delay = 1.0
+            while True:
+                batch = self._client.messages.batches.retrieve(batch.id)
+                if batch.processing_status == "ended":
+                    break
+                if time.monotonic() + delay > deadline:
+                    raise TimeoutError("batch did not finish in time")
+                time.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+            results: list[str | None] = [None] * len(items)
+            for entry in self._client.messages.batches.results(batch.id):
+                if entry.result.type != "succeeded":
+                    continue
+                index = int(entry.custom_id)
+                for block in entry.result.message.content:
+                    text = getattr(block, "text", None)
+                    if text is not None:
+                        results[index] = text
+                        break
+            return results
+        except Exception:
+            logger.warning("Batch reasoning failed; falling back to sequential calls")
+            return [self.reason(context, prompt) for context, prompt in items]
+
     def _call_api(
-        self, system_prompt: str, messages: list[dict[str, Any]]
+        self, system_prompt: str | list[dict[str, Any]], messages: list[dict[str, Any]]
     ) -> Any:
         """Call the Claude API with tools."""
-        return self._client.messages.create(
-            model=self.config.agent.model,
-            max_tokens=4096,
-            system=system_prompt,
-            messages=messages,
-            tools=TOOLS,
-        )
+        return self._create_with_tools(system=system_prompt, messages=messages)
+
+    def _run_tools(
+        self, tool_blocks: list[Any], seen_calls: dict[tuple[str, str], str]
+    ) -> list[str]:
+        """Execute a turn's tool calls, overlapping the read-only ones.
+
+        Read-only tools (memory search) are independent I/O and run
+        concurrently; mutating tools (shell, notifications) run serially in
+        request order. A repeated read-only call with identical arguments
+        is served from seen_calls, which the caller keeps for the whole
+        conversation turn. Results are returned in the original block order.
+        """
+        results: dict[int, str] = {}
+        pending: list[tuple[int, Any, tuple[str, str]]] = []
+        for i, block in enumerate(tool_blocks):
+            if block.name not in _READ_ONLY_TOOLS:
+                continue
+            key = (block.name, json.dumps(block.input, sort_keys=True, default=str))
+            cached = seen_calls.get(key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, block, key))
+
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                futures = [
+                    (i, key, pool.submit(self._handle_tool, b.name, b.input))
+                    for i, b, key in pending
+                ]
+                for i, key, future in futures:
+                    results[i] = seen_calls[key] = future.result()
+        else:
+            for i, block, key in pending:
+                results[i] = seen_calls[key] = self._handle_tool(block.name, block.input)
+
+        for i, block in enumerate(tool_blocks):
+            if i not in results:
+                results[i] = self._handle_tool(block.name, block.input)
+
+        return [results[i] for i in range(len(tool_blocks))]
 
     def _handle_tool(self, tool_name: str, tool_input: dict[str, Any]) -> str:
         """Dispatch a tool call and return the result as a string."""
-        if tool_name == "search_memory":
-            return self._tool_search_memory(tool_input["query"])
-        elif tool_name == "execute_shell":
-            return self._tool_execute_shell(tool_input["command"])
-        elif tool_name == "send_notification":
-            return self._tool_send_notification(
-                tool_input["notification_type"],
-                tool_input["message"],
-            )
-        else:
+        handler = self._tool_handlers.get(tool_name)
+        if handler is None:
             return f"Unknown tool: {tool_name}"
+        return handler(tool_input)
 
-    def _tool_search_memory(self, query: str) -> str:
+    def _tool_search_memory(self, tool_input: dict[str, Any]) -> str:
         """Search memory and return formatted results."""
-        context = self.memory.get_context(query)
+        context = self.memory.get_context(tool_input["query"])
         return context if context else "No relevant memory found."
 
-    def _tool_execute_shell(self, command: str) -> str:
-        """Execute a shell command and return output."""
+    def _tool_execute_shell(self, tool_input: dict[str, Any]) -> str:
+        """Execute a shell command and return output.
+
+        Commands go through the persistent shell to skip per-call
+        fork+exec; a dead or unusable shell falls back to one-shot
+        subprocess.run.
+        """
+        command = tool_input["command"]
+        try:
+            stdout, stderr, returncode = self._shell.run(command, timeout=30.0)
+        except TimeoutError:
+            return "Command timed out after 30 seconds."
+        except Exception:
+            return self._execute_shell_oneshot(command)
+
+        output = stdout
+        if stderr:
+            output += f"\nSTDERR: {stderr}"
+        if returncode != 0:
+            output += f"\nExit code: {returncode}"
+        return output[:5000] if output else "(no output)"
+
+    def _execute_shell_oneshot(self, command: str) -> str:
+        """One-shot subprocess fallback for when the shared shell is down."""
         try:
             result = subprocess.run(
                 command,
@@ -229,12 +646,13 @@ class Agent:
         except Exception as e:
             return f"Error executing command: {e}"
 
-    def _tool_send_notification(self, notification_type: str, message: str) -> str:
+    def _tool_send_notification(self, tool_input: dict[str, Any]) -> str:
         """Send a notification via the notifier."""
+        notification_type = tool_input["notification_type"]
         if self.notifier is None:
             return "Notification system not configured."
         try:
-            self.notifier.notify(notification_type, message)
+            self.notifier.notify(notification_type, tool_input["message"])
             return f"Notification sent ({notification_type})."
         except Exception as e:
             return f"Failed to send notification: {e}"
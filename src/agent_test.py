@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -39,27 +40,30 @@ def config():
 
 
 def test_build_system_prompt_includes_soul(mock_memory, sample_skills):
-    prompt = _build_system_prompt(mock_memory, sample_skills, "test query")
+    prompt = _build_system_prompt(mock_memory, sample_skills)
     assert "helpful assistant" in prompt
 
 
 def test_build_system_prompt_includes_user(mock_memory, sample_skills):
-    prompt = _build_system_prompt(mock_memory, sample_skills, "test query")
+    prompt = _build_system_prompt(mock_memory, sample_skills)
     assert "concise answers" in prompt
 
 
-def test_build_system_prompt_includes_memory(mock_memory, sample_skills):
-    prompt = _build_system_prompt(mock_memory, sample_skills, "test query")
-    assert "Relevant Memory" in prompt
+def test_build_system_prompt_excludes_memory_search(mock_memory, sample_skills):
+    # Memory retrieval goes through the search_memory tool, not the prompt,
+    # so the prompt stays stable across turns for caching.
+    prompt = _build_system_prompt(mock_memory, sample_skills)
+    assert "Relevant Memory" not in prompt
+    mock_memory.get_context.assert_not_called()
 
 
 def test_build_system_prompt_includes_skills(mock_memory, sample_skills):
-    prompt = _build_system_prompt(mock_memory, sample_skills, "test query")
+    prompt = _build_system_prompt(mock_memory, sample_skills)
     assert "weather" in prompt
 
 
 def test_build_system_prompt_no_skills(mock_memory):
-    prompt = _build_system_prompt(mock_memory, [], "test query")
+    prompt = _build_system_prompt(mock_memory, [])
     assert "Available Skills" not in prompt
 
 
@@ -170,3 +174,188 @@ def test_chat_handles_tool_use(mock_anthropic_cls, config, mock_memory, sample_s
 
     assert response_text == "Based on memory, you prefer X."
     assert mock_client.messages.create.call_count == 2
+
+
+@patch("src.agent.anthropic.Anthropic")
+def test_chat_strips_stale_cache_controls(mock_anthropic_cls, config, mock_memory, sample_skills):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+
+    def tool_response():
+        tool_block = MagicMock()
+        tool_block.type = "tool_use"
+        tool_block.name = "search_memory"
+        tool_block.input = {"query": "preferences"}
+        tool_block.id = "tool_123"
+        response = MagicMock()
+        response.stop_reason = "tool_use"
+        response.content = [tool_block]
+        return response
+
+    def text_response():
+        text_block = MagicMock()
+        text_block.type = "text"
+        text_block.text = "done"
+        response = MagicMock()
+        response.stop_reason = "end_turn"
+        response.content = [text_block]
+        return response
+
+    mock_client.messages.create.side_effect = [
+        tool_response(), text_response(),  # turn 1
+        tool_response(), text_response(),  # turn 2
+    ]
+
+    def markers(msgs):
+        return [
+            block
+            for m in msgs
+            if isinstance(m.get("content"), list)
+            for block in m["content"]
+            if isinstance(block, dict) and "cache_control" in block
+        ]
+
+    agent = Agent(config, mock_memory, sample_skills)
+    _, history = agent.chat([], "first")
+    # Each turn leaves its moving breakpoint on the final tool_result
+    assert len(markers(history)) == 1
+
+    # Replaying the history must not accumulate a second marker — the
+    # API rejects requests with more than 4 breakpoints
+    _, history = agent.chat(history, "second")
+    assert len(markers(history)) == 1
+
+
+@patch("src.agent.anthropic.Anthropic")
+def test_chat_stream_yields_chunks(mock_anthropic_cls, config, mock_memory, sample_skills):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+
+    text_block = MagicMock()
+    text_block.type = "text"
+    text_block.text = "Hello world."
+
+    final_message = MagicMock()
+    final_message.stop_reason = "end_turn"
+    final_message.content = [text_block]
+
+    stream = MagicMock()
+    stream.text_stream = iter(["Hello ", "world."])
+    stream.get_final_message.return_value = final_message
+    mock_client.messages.stream.return_value.__enter__.return_value = stream
+
+    agent = Agent(config, mock_memory, sample_skills)
+    gen = agent.chat_stream([], "hi")
+
+    chunks = []
+    while True:
+        try:
+            chunks.append(next(gen))
+        except StopIteration as stop:
+            history = stop.value
+            break
+
+    assert "".join(chunks) == "Hello world."
+    assert history[0] == {"role": "user", "content": "hi"}
+    assert history[-1]["role"] == "assistant"
+
+
+def _batch_entry(custom_id: str, text: str) -> MagicMock:
+    block = MagicMock()
+    block.text = text
+    entry = MagicMock()
+    entry.custom_id = custom_id
+    entry.result.type = "succeeded"
+    entry.result.message.content = [block]
+    return entry
+
+
+@patch("src.agent.anthropic.Anthropic")
+def test_reason_batch_returns_ordered_results(mock_anthropic_cls, config, mock_memory, sample_skills):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+
+    batch = MagicMock()
+    batch.id = "batch_1"
+    batch.processing_status = "ended"
+    mock_client.messages.batches.create.return_value = batch
+    mock_client.messages.batches.retrieve.return_value = batch
+    # Results arrive out of order; custom_id maps them back.
+    mock_client.messages.batches.results.return_value = [
+        _batch_entry("1", "second"),
+        _batch_entry("0", "first"),
+    ]
+
+    agent = Agent(config, mock_memory, sample_skills)
+    results = agent.reason_batch([("ctx", "one"), ("ctx", "two")])
+
+    assert results == ["first", "second"]
+    mock_client.messages.create.assert_not_called()
+
+
+@patch("src.agent.anthropic.Anthropic")
+def test_reason_batch_falls_back_to_sequential(mock_anthropic_cls, config, mock_memory, sample_skills):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+    mock_client.messages.batches.create.side_effect = RuntimeError("batch API down")
+
+    text_block = MagicMock()
+    text_block.text = "online answer"
+    response = MagicMock()
+    response.content = [text_block]
+    mock_client.messages.create.return_value = response
+
+    agent = Agent(config, mock_memory, sample_skills)
+    results = agent.reason_batch([("ctx", "one"), ("ctx", "two")])
+
+    assert results == ["online answer", "online answer"]
+    assert mock_client.messages.create.call_count == 2
+
+
+@patch("src.agent.anthropic.Anthropic")
+def test_reason_semantic_cache_hit_from_worker_thread(
+    mock_anthropic_cls, config, mock_memory, sample_skills
+):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+    text_block = MagicMock()
+    text_block.text = "cached answer"
+    response = MagicMock()
+    response.content = [text_block]
+    mock_client.messages.create.return_value = response
+    mock_memory.embed_text.return_value = [0.5] * 384
+
+    agent = Agent(config, mock_memory, sample_skills)
+    # Run on a worker thread, as the heartbeat scheduler does.
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(agent.reason, "ctx", "status?").result()
+        second = pool.submit(agent.reason, "ctx", "status?").result()
+
+    assert first == "cached answer"
+    assert second == "cached answer"
+    # The repeat call is served from the semantic cache
+    assert mock_client.messages.create.call_count == 1
+
+
+@patch("src.agent.anthropic.Anthropic")
+def test_reason_logs_embed_failure(
+    mock_anthropic_cls, config, mock_memory, sample_skills, caplog
+):
+    mock_client = MagicMock()
+    mock_anthropic_cls.return_value = mock_client
+    text_block = MagicMock()
+    text_block.text = "answer"
+    response = MagicMock()
+    response.content = [text_block]
+    mock_client.messages.create.return_value = response
+    mock_memory.embed_text.side_effect = RuntimeError("embedder down")
+
+    agent = Agent(config, mock_memory, sample_skills)
+    with caplog.at_level(logging.WARNING, logger="src.agent"):
+        result = agent.reason("ctx", "status?")
+
+    # The call still succeeds, but the broken embed path is visible
+    assert result == "answer"
+    assert any("Semantic cache" in r.message for r in caplog.records)
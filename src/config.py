@@ -7,8 +7,14 @@ from typing import Any
 
 import yaml
 
+try:
+    # libyaml-backed loader; roughly 10x faster than the pure-Python one.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class MemoryConfig:
     dir: str = "memory"
     db_path: str = "data/memory.db"
@@ -18,30 +24,31 @@ class MemoryConfig:
     vector_weight: float = 0.7
     text_weight: float = 0.3
     embedding_model: str = "BAAI/bge-small-en-v1.5"
+    embedding_dim: int = 384
     watch: bool = True
     watch_debounce_seconds: int = 5
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GmailConfig:
     enabled: bool = False
     poll_interval_minutes: int = 15
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CalendarConfig:
     enabled: bool = False
     poll_interval_minutes: int = 15
     hours_ahead: int = 24
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DailySummaryConfig:
     enabled: bool = False
     time: str = "08:00"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HeartbeatConfig:
     enabled: bool = False
     gmail: GmailConfig = field(default_factory=GmailConfig)
@@ -49,7 +56,7 @@ class HeartbeatConfig:
     daily_summary: DailySummaryConfig = field(default_factory=DailySummaryConfig)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NotificationsConfig:
     urgent_email: str = "whatsapp"
     calendar_reminder: str = "whatsapp"
@@ -57,40 +64,40 @@ class NotificationsConfig:
     default: str = "terminal"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TerminalAdapterConfig:
     enabled: bool = True
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WhatsAppAdapterConfig:
     enabled: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AdaptersConfig:
     terminal: TerminalAdapterConfig = field(default_factory=TerminalAdapterConfig)
     whatsapp: WhatsAppAdapterConfig = field(default_factory=WhatsAppAdapterConfig)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SkillsConfig:
     dir: str = "skills"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AgentConfig:
     model: str = "claude-sonnet-4-20250514"
     session_timeout_minutes: int = 30
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GoogleConfig:
     credentials_path: str = "credentials.json"
     token_path: str = "token.json"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
     memory: MemoryConfig = field(default_factory=MemoryConfig)
     heartbeat: HeartbeatConfig = field(default_factory=HeartbeatConfig)
@@ -102,28 +109,39 @@ class Config:
 
 
 def _deep_merge(base: dict, override: dict) -> dict:
-    """Merge override into base, recursively for nested dicts."""
-    result = base.copy()
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _deep_merge(result[key], value)
-        else:
-            result[key] = value
+    """Merge override into base, recursively for nested dicts.
+
+    Neither input is mutated; shared sub-dicts are copied once, on the
+    first write into them, instead of copying every level up front.
+    """
+    result = {**base}
+    stack = [(result, override)]
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            existing = dst.get(key)
+            if isinstance(existing, dict) and isinstance(value, dict):
+                dst[key] = existing = {**existing}
+                stack.append((existing, value))
+            else:
+                dst[key] = value
     return result
 
 
+_ENV_MAP = {
+    "ANTHROPIC_API_KEY": None,  # handled by SDK directly
+    "PYCLAW_GOOGLE_CREDENTIALS_PATH": ("google", "credentials_path"),
+    "PYCLAW_GOOGLE_TOKEN_PATH": ("google", "token_path"),
+    "PYCLAW_MEMORY_DIR": ("memory", "dir"),
+    "PYCLAW_MEMORY_DB_PATH": ("memory", "db_path"),
+    "PYCLAW_SKILLS_DIR": ("skills", "dir"),
+    "PYCLAW_AGENT_MODEL": ("agent", "model"),
+}
+
+
 def _apply_env_overrides(raw: dict[str, Any]) -> dict[str, Any]:
     """Override config values with environment variables."""
-    env_map = {
-        "ANTHROPIC_API_KEY": None,  # handled by SDK directly
-        "PYCLAW_GOOGLE_CREDENTIALS_PATH": ("google", "credentials_path"),
-        "PYCLAW_GOOGLE_TOKEN_PATH": ("google", "token_path"),
-        "PYCLAW_MEMORY_DIR": ("memory", "dir"),
-        "PYCLAW_MEMORY_DB_PATH": ("memory", "db_path"),
-        "PYCLAW_SKILLS_DIR": ("skills", "dir"),
-        "PYCLAW_AGENT_MODEL": ("agent", "model"),
-    }
-    for env_var, path in env_map.items():
+    for env_var, path in _ENV_MAP.items():
         value = os.environ.get(env_var)
         if value is None or path is None:
             continue
@@ -134,96 +152,109 @@ def _apply_env_overrides(raw: dict[str, Any]) -> dict[str, Any]:
     return raw
 
 
-def _build_nested_config(cls: type, data: dict[str, Any] | None) -> Any:
-    """Recursively build a dataclass from a dict."""
-    if data is None:
-        return cls()
-    kwargs = {}
-    for f in cls.__dataclass_fields__.values():
-        if f.name not in data:
-            continue
-        value = data[f.name]
-        if hasattr(f.type, "__dataclass_fields__") if isinstance(f.type, type) else False:
-            kwargs[f.name] = _build_nested_config(f.type, value)
-        else:
-            # Resolve string type annotations for nested dataclasses
-            resolved_type = cls.__dataclass_fields__[f.name].type
-            if isinstance(resolved_type, str):
-                resolved_type = globals().get(resolved_type) or locals().get(resolved_type)
-            if isinstance(resolved_type, type) and hasattr(resolved_type, "__dataclass_fields__"):
-                kwargs[f.name] = _build_nested_config(resolved_type, value)
-            else:
-                kwargs[f.name] = value
-    return cls(**kwargs)
-
-
-_NESTED_TYPES = {
-    "memory": MemoryConfig,
-    "heartbeat": HeartbeatConfig,
-    "notifications": NotificationsConfig,
-    "adapters": AdaptersConfig,
-    "skills": SkillsConfig,
-    "agent": AgentConfig,
-    "google": GoogleConfig,
-}
+def _dict_to_config(raw: dict[str, Any]) -> Config:
+    """Convert a raw dict to a Config dataclass.
 
-_HEARTBEAT_NESTED = {
-    "gmail": GmailConfig,
-    "calendar": CalendarConfig,
-    "daily_summary": DailySummaryConfig,
-}
+    Every section is spelled out so construction is straight-line dict
+    access — no dataclass-field reflection on the load path.
+    """
+    kwargs: dict[str, Any] = {}
 
-_ADAPTERS_NESTED = {
-    "terminal": TerminalAdapterConfig,
-    "whatsapp": WhatsAppAdapterConfig,
-}
+    memory = raw.get("memory")
+    if memory is not None:
+        kwargs["memory"] = MemoryConfig(**memory)
+
+    heartbeat = raw.get("heartbeat")
+    if heartbeat is not None:
+        hb = {**heartbeat}
+        gmail = hb.get("gmail")
+        if isinstance(gmail, dict):
+            hb["gmail"] = GmailConfig(**gmail)
+        calendar = hb.get("calendar")
+        if isinstance(calendar, dict):
+            hb["calendar"] = CalendarConfig(**calendar)
+        daily_summary = hb.get("daily_summary")
+        if isinstance(daily_summary, dict):
+            hb["daily_summary"] = DailySummaryConfig(**daily_summary)
+        kwargs["heartbeat"] = HeartbeatConfig(**hb)
+
+    notifications = raw.get("notifications")
+    if notifications is not None:
+        kwargs["notifications"] = NotificationsConfig(**notifications)
+
+    adapters = raw.get("adapters")
+    if adapters is not None:
+        adp = {**adapters}
+        terminal = adp.get("terminal")
+        if isinstance(terminal, dict):
+            adp["terminal"] = TerminalAdapterConfig(**terminal)
+        whatsapp = adp.get("whatsapp")
+        if isinstance(whatsapp, dict):
+            adp["whatsapp"] = WhatsAppAdapterConfig(**whatsapp)
+        kwargs["adapters"] = AdaptersConfig(**adp)
+
+    skills = raw.get("skills")
+    if skills is not None:
+        kwargs["skills"] = SkillsConfig(**skills)
+
+    agent = raw.get("agent")
+    if agent is not None:
+        kwargs["agent"] = AgentConfig(**agent)
+
+    google = raw.get("google")
+    if google is not None:
+        kwargs["google"] = GoogleConfig(**google)
 
+    return Config(**kwargs)
 
-def _dict_to_config(raw: dict[str, Any]) -> Config:
-    """Convert a raw dict to a Config dataclass."""
-    kwargs: dict[str, Any] = {}
-    for section_name, section_cls in _NESTED_TYPES.items():
-        section_data = raw.get(section_name)
-        if section_data is None:
-            continue
 
-        if section_name == "heartbeat" and isinstance(section_data, dict):
-            hb_kwargs: dict[str, Any] = {}
-            for k, v in section_data.items():
-                if k in _HEARTBEAT_NESTED and isinstance(v, dict):
-                    hb_kwargs[k] = _HEARTBEAT_NESTED[k](**v)
-                else:
-                    hb_kwargs[k] = v
-            kwargs[section_name] = HeartbeatConfig(**hb_kwargs)
-        elif section_name == "adapters" and isinstance(section_data, dict):
-            adp_kwargs: dict[str, Any] = {}
-            for k, v in section_data.items():
-                if k in _ADAPTERS_NESTED and isinstance(v, dict):
-                    adp_kwargs[k] = _ADAPTERS_NESTED[k](**v)
-                else:
-                    adp_kwargs[k] = v
-            kwargs[section_name] = AdaptersConfig(**adp_kwargs)
-        elif isinstance(section_data, dict):
-            kwargs[section_name] = section_cls(**section_data)
-        else:
-            kwargs[section_name] = section_data
+def load_config_from_dict(raw: dict[str, Any]) -> Config:
+    """Build a Config from an in-memory mapping, skipping YAML and disk.
 
-    return Config(**kwargs)
+    Shares the env-override and dataclass-construction path with
+    load_config; useful for tests that don't exercise YAML parsing.
+    """
+    return _dict_to_config(_apply_env_overrides({**raw}))
+
+
+# Parsed configs keyed by (path, mtime_ns, relevant env values); a file
+# edit or env change produces a new key, so stale entries are never served.
+_load_cache: dict[tuple[Any, ...], Config] = {}
+_LOAD_CACHE_MAX = 8
 
 
 def load_config(config_path: str | Path = "config.yaml") -> Config:
     """Load configuration from a YAML file with env var overrides.
 
-    If the file doesn't exist, returns default config.
+    If the file doesn't exist, returns default config. Repeated loads of
+    an unchanged file return a cached Config without re-reading disk.
     """
     config_path = Path(config_path)
-    raw: dict[str, Any] = {}
+    try:
+        mtime_ns: int | None = config_path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+
+    key = (
+        str(config_path),
+        mtime_ns,
+        tuple(os.environ.get(var) for var in _ENV_MAP),
+    )
+    cached = _load_cache.get(key)
+    if cached is not None:
+        return cached
 
-    if config_path.exists():
+    raw: dict[str, Any] = {}
+    if mtime_ns is not None:
         with open(config_path) as f:
-            loaded = yaml.safe_load(f)
+            loaded = yaml.load(f, Loader=_YamlLoader)
             if isinstance(loaded, dict):
                 raw = loaded
 
     raw = _apply_env_overrides(raw)
-    return _dict_to_config(raw)
+    config = _dict_to_config(raw)
+
+    if len(_load_cache) >= _LOAD_CACHE_MAX:
+        _load_cache.clear()
+    _load_cache[key] = config
+    return config
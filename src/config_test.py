@@ -7,12 +7,14 @@ from pathlib import Path
 import pytest
 import yaml
 
-from src.config import Config, load_config
+from src.config import Config, load_config, load_config_from_dict
+
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 def _write_yaml(path: Path, data: dict) -> None:
     with open(path, "w") as f:
-        yaml.dump(data, f)
+        yaml.dump(data, f, Dumper=_Dumper)
 
 
 class TestLoadConfig:
@@ -99,3 +101,25 @@ class TestLoadConfig:
         assert cfg.notifications.urgent_email == "terminal"
         assert cfg.notifications.daily_summary == "whatsapp"
         assert cfg.notifications.default == "terminal"
+
+    def test_load_from_dict(self) -> None:
+        cfg = load_config_from_dict({
+            "memory": {"dir": "inline_memory"},
+            "heartbeat": {"gmail": {"enabled": True}},
+        })
+        assert cfg.memory.dir == "inline_memory"
+        assert cfg.heartbeat.gmail.enabled is True
+        assert cfg.agent.model == "claude-sonnet-4-20250514"
+
+    def test_caches_unchanged_file(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "config.yaml"
+        _write_yaml(config_file, {"memory": {"dir": "first"}})
+        cfg1 = load_config(config_file)
+        cfg2 = load_config(config_file)
+        assert cfg1 is cfg2
+
+        _write_yaml(config_file, {"memory": {"dir": "second"}})
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        cfg3 = load_config(config_file)
+        assert cfg3.memory.dir == "second"
@@ -1,17 +1,61 @@
 from __future__ import annotations
 
+import functools
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
 
-def _get_calendar_service(credentials_path: str, token_path: str) -> Any:
-    """Build and return an authenticated Google Calendar API service."""
+@functools.cache
+def _google_imports() -> tuple[Any, Any, Any, Any]:
+    """Resolve the Google client imports once; later calls are a dict hit."""
     from google.auth.transport.requests import Request  # type: ignore[import-untyped]
     from google.oauth2.credentials import Credentials  # type: ignore[import-untyped]
     from google_auth_oauthlib.flow import InstalledAppFlow  # type: ignore[import-untyped]
     from googleapiclient.discovery import build  # type: ignore[import-untyped]
 
+    return Request, Credentials, InstalledAppFlow, build
+
+
+class _DiscoveryCache:
+    """Process-wide cache for discovery documents fetched by build()."""
+
+    _docs: dict[str, str] = {}
+
+    def get(self, url: str) -> str | None:
+        return self._docs.get(url)
+
+    def set(self, url: str, content: str) -> None:
+        self._docs[url] = content
+
+
+# (credentials_path, token_path) -> (Credentials, service); polling
+# reuses the built service and only refreshes when the token expires.
+_service_cache: dict[tuple[str, str], tuple[Any, Any]] = {}
+
+
+def _get_calendar_service(credentials_path: str, token_path: str) -> Any:
+    """Build and return an authenticated Google Calendar API service.
+
+    The service (and its discovery document) is built once per process;
+    subsequent calls reuse it, refreshing the credentials in place when
+    they expire instead of re-reading token.json.
+    """
+    Request, Credentials, InstalledAppFlow, build = _google_imports()
+
+    cache_key = (credentials_path, token_path)
+    cached = _service_cache.get(cache_key)
+    if cached is not None:
+        creds, service = cached
+        if creds.valid:
+            return service
+        if creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+            with open(token_path, "w") as f:
+                f.write(creds.to_json())
+            return service
+        del _service_cache[cache_key]
+
     SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
     creds = None
 
@@ -27,7 +71,9 @@ def _get_calendar_service(credentials_path: str, token_path: str) -> Any:
         with open(token_path, "w") as f:
             f.write(creds.to_json())
 
-    return build("calendar", "v3", credentials=creds)
+    service = build("calendar", "v3", credentials=creds, cache=_DiscoveryCache())
+    _service_cache[cache_key] = (creds, service)
+    return service
 
 
 def fetch_upcoming_events(
@@ -61,6 +107,8 @@ def fetch_upcoming_events(
             maxResults=max_results,
             singleEvents=True,
             orderBy="startTime",
+            # Partial response: only the fields extracted below.
+            fields="items(summary,start,end,location,attendees/email)",
         )
         .execute()
     )
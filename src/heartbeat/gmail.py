@@ -1,19 +1,62 @@
 from __future__ import annotations
 
 import base64
+import functools
 import os
-from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 
-def _get_gmail_service(credentials_path: str, token_path: str) -> Any:
-    """Build and return an authenticated Gmail API service."""
+@functools.cache
+def _google_imports() -> tuple[Any, Any, Any, Any]:
+    """Resolve the Google client imports once; later calls are a dict hit."""
     from google.auth.transport.requests import Request  # type: ignore[import-untyped]
     from google.oauth2.credentials import Credentials  # type: ignore[import-untyped]
     from google_auth_oauthlib.flow import InstalledAppFlow  # type: ignore[import-untyped]
     from googleapiclient.discovery import build  # type: ignore[import-untyped]
 
+    return Request, Credentials, InstalledAppFlow, build
+
+
+class _DiscoveryCache:
+    """Process-wide cache for discovery documents fetched by build()."""
+
+    _docs: dict[str, str] = {}
+
+    def get(self, url: str) -> str | None:
+        return self._docs.get(url)
+
+    def set(self, url: str, content: str) -> None:
+        self._docs[url] = content
+
+
+# (credentials_path, token_path) -> (Credentials, service); polling
+# reuses the built service and only refreshes when the token expires.
+_service_cache: dict[tuple[str, str], tuple[Any, Any]] = {}
+
+
+def _get_gmail_service(credentials_path: str, token_path: str) -> Any:
+    """Build and return an authenticated Gmail API service.
+
+    The service (and its discovery document) is built once per process;
+    subsequent calls reuse it, refreshing the credentials in place when
+    they expire instead of re-reading token.json.
+    """
+    Request, Credentials, InstalledAppFlow, build = _google_imports()
+
+    cache_key = (credentials_path, token_path)
+    cached = _service_cache.get(cache_key)
+    if cached is not None:
+        creds, service = cached
+        if creds.valid:
+            return service
+        if creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+            with open(token_path, "w") as f:
+                f.write(creds.to_json())
+            return service
+        del _service_cache[cache_key]
+
     SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]
     creds = None
 
@@ -29,7 +72,9 @@ def _get_gmail_service(credentials_path: str, token_path: str) -> Any:
         with open(token_path, "w") as f:
             f.write(creds.to_json())
 
-    return build("gmail", "v1", credentials=creds)
+    service = build("gmail", "v1", credentials=creds, cache=_DiscoveryCache())
+    _service_cache[cache_key] = (creds, service)
+    return service
 
 
 def fetch_unread_emails(
@@ -53,8 +98,9 @@ def fetch_unread_emails(
 
     query = "is:unread"
     if since_timestamp:
-        dt = datetime.fromtimestamp(since_timestamp, tz=timezone.utc)
-        query += f" after:{dt.strftime('%Y/%m/%d')}"
+        # Gmail accepts epoch seconds here; the YYYY/MM/DD form is only
+        # day-granular and refetched the same messages all day.
+        query += f" after:{int(since_timestamp)}"
 
     results = (
         service.users()
@@ -64,20 +110,45 @@ def fetch_unread_emails(
     )
 
     messages = results.get("messages", [])
-    emails: list[dict[str, Any]] = []
+    if not messages:
+        return []
+
+    # One multipart batch instead of a round-trip per message.
+    fetched: list[dict[str, Any]] = []
 
+    def _collect(request_id: str, msg: dict[str, Any], exception: Any) -> None:
+        if exception is None and msg is not None:
+            fetched.append(msg)
+
+    batch = service.new_batch_http_request(callback=_collect)
     for msg_ref in messages:
-        msg = (
+        batch.add(
             service.users()
             .messages()
-            .get(userId="me", id=msg_ref["id"], format="metadata")
-            .execute()
+            .get(
+                userId="me",
+                id=msg_ref["id"],
+                format="metadata",
+                metadataHeaders=["From", "Subject"],
+            )
         )
+    batch.execute()
 
-        headers = {h["name"]: h["value"] for h in msg.get("payload", {}).get("headers", [])}
+    emails: list[dict[str, Any]] = []
+    for msg in fetched:
+        # Only two headers matter; scan and break instead of building a dict.
+        sender = subject = ""
+        for h in msg.get("payload", {}).get("headers", ()):
+            name = h["name"]
+            if name == "From":
+                sender = h["value"]
+            elif name == "Subject":
+                subject = h["value"]
+            if sender and subject:
+                break
         emails.append({
-            "sender": headers.get("From", ""),
-            "subject": headers.get("Subject", ""),
+            "sender": sender,
+            "subject": subject,
             "snippet": msg.get("snippet", ""),
             "timestamp": int(msg.get("internalDate", 0)) / 1000,
             "labels": msg.get("labelIds", []),
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import dataclasses
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -17,6 +18,13 @@ class Notifier:
     ) -> None:
         self._config = config
         self._registry = adapter_registry
+        # notification_type -> channel, computed once so notify() is a
+        # dict hit instead of getattr + isinstance per call.
+        self._channel_map = {
+            f.name: getattr(config, f.name)
+            for f in dataclasses.fields(config)
+            if isinstance(getattr(config, f.name), str)
+        }
 
     def notify(self, notification_type: str, message: str, to: str = "user") -> None:
         """Send a notification via the configured channel for this type.
@@ -28,9 +36,8 @@ class Notifier:
 
     def _resolve_channel(self, notification_type: str) -> str:
         """Look up which channel to use for a given notification type."""
-        # Check if there's a specific mapping for this type
-        channel = getattr(self._config, notification_type, None)
-        if channel and isinstance(channel, str):
+        channel = self._channel_map.get(notification_type)
+        if channel:
             return channel
         # Fall back to default
         return self._config.default
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
+import threading
 import time
+from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any, Callable
 
 if TYPE_CHECKING:
@@ -11,6 +15,78 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Pre-parsed templates for the prompt formatters; {snippet:.200} truncates
+# during formatting without an intermediate slice.
+_EMAIL_TMPL = "- **From:** {sender}\n  **Subject:** {subject}\n  **Preview:** {snippet:.200}\n"
+_EVENT_TMPL = "- **{title}**\n  {start_time} - {end_time}\n"
+_EVENT_LOC_TMPL = "- **{title}**\n  {start_time} - {end_time}\n  Location: {location}\n"
+
+
+class _MiniScheduler:
+    """Minimal heapq-based job scheduler for the fixed heartbeat job set.
+
+    Replaces APScheduler's BackgroundScheduler: one daemon thread sleeps
+    until the next due job, runs it, and reschedules. Supports the two
+    shapes the heartbeat needs — fixed-interval jobs and a daily
+    at-HH:MM job — without pulling in a scheduling framework.
+    """
+
+    def __init__(self) -> None:
+        # Heap entries are (due_time, seq, run_fn, next_due_fn); seq keeps
+        # the tuple comparison away from the callables.
+        self._heap: list[tuple[float, int, Callable[[], None], Callable[[], float]]] = []
+        self._seq = itertools.count()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add_interval_job(self, fn: Callable[[], None], minutes: float) -> None:
+        period = minutes * 60.0
+        self._push(time.time() + period, fn, lambda: time.time() + period)
+
+    def add_daily_job(self, fn: Callable[[], None], hour: int, minute: int) -> None:
+        def next_due() -> float:
+            now = datetime.now()
+            run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if run <= now:
+                run += timedelta(days=1)
+            return run.timestamp()
+
+        self._push(next_due(), fn, next_due)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="heartbeat-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def _push(
+        self, due: float, fn: Callable[[], None], next_due: Callable[[], float]
+    ) -> None:
+        heapq.heappush(self._heap, (due, next(self._seq), fn, next_due))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if not self._heap:
+                return
+            due = self._heap[0][0]
+            delay = due - time.time()
+            if delay > 0:
+                # Cap the wait so wall-clock jumps are noticed promptly.
+                if self._stop.wait(min(delay, 60.0)):
+                    return
+                continue
+            _, _, fn, next_due = heapq.heappop(self._heap)
+            try:
+                fn()
+            except Exception:
+                logger.exception("Scheduled job failed")
+            self._push(next_due(), fn, next_due)
+
 
 class HeartbeatScheduler:
     """Schedules periodic data-gathering jobs (Gmail, Calendar) and daily summaries.
@@ -33,40 +109,29 @@ class HeartbeatScheduler:
         self._scheduler: Any = None
         self._last_gmail_check: float = 0
         self._last_calendar_check: float = 0
+        # (SOUL.md mtime, USER.md mtime) -> joined context, so steady-state
+        # ticks skip the reads and the join.
+        self._context_cache: tuple[tuple[float | None, float | None], str] | None = None
 
     def start(self) -> None:
         """Start the background scheduler with configured jobs."""
-        from apscheduler.schedulers.background import BackgroundScheduler  # type: ignore[import-untyped]
-
-        self._scheduler = BackgroundScheduler()
+        self._scheduler = _MiniScheduler()
 
         hb = self._config.heartbeat
 
         if hb.gmail.enabled:
-            self._scheduler.add_job(
-                self._check_gmail,
-                "interval",
-                minutes=hb.gmail.poll_interval_minutes,
-                id="gmail_check",
+            self._scheduler.add_interval_job(
+                self._check_gmail, hb.gmail.poll_interval_minutes
             )
 
         if hb.calendar.enabled:
-            self._scheduler.add_job(
-                self._check_calendar,
-                "interval",
-                minutes=hb.calendar.poll_interval_minutes,
-                id="calendar_check",
+            self._scheduler.add_interval_job(
+                self._check_calendar, hb.calendar.poll_interval_minutes
             )
 
         if hb.daily_summary.enabled:
             hour, minute = self._parse_time(hb.daily_summary.time)
-            self._scheduler.add_job(
-                self._daily_summary,
-                "cron",
-                hour=hour,
-                minute=minute,
-                id="daily_summary",
-            )
+            self._scheduler.add_daily_job(self._daily_summary, hour, minute)
 
         self._scheduler.start()
         logger.info("Heartbeat scheduler started")
@@ -96,14 +161,17 @@ class HeartbeatScheduler:
             # Format email data for reasoning
             email_summary = self._format_emails(emails)
             context = self._get_user_context()
-            prompt = (
-                f"{context}\n\n"
-                f"## New Emails\n{email_summary}\n\n"
+            prompt = "\n".join((
+                context,
+                "",
+                "## New Emails",
+                email_summary,
+                "",
                 "Based on these emails and the user's preferences, "
                 "should the user be notified about any of them? "
                 "If yes, write a brief notification message. "
-                "If no, respond with exactly: NO_NOTIFICATION"
-            )
+                "If no, respond with exactly: NO_NOTIFICATION",
+            ))
 
             response = self._reason(prompt)
             if response and "NO_NOTIFICATION" not in response:
@@ -129,14 +197,17 @@ class HeartbeatScheduler:
 
             events_summary = self._format_events(events)
             context = self._get_user_context()
-            prompt = (
-                f"{context}\n\n"
-                f"## Upcoming Events\n{events_summary}\n\n"
+            prompt = "\n".join((
+                context,
+                "",
+                "## Upcoming Events",
+                events_summary,
+                "",
                 "Based on these events and the user's preferences, "
                 "should the user be reminded about anything? "
                 "If yes, write a brief reminder. "
-                "If no, respond with exactly: NO_NOTIFICATION"
-            )
+                "If no, respond with exactly: NO_NOTIFICATION",
+            ))
 
             response = self._reason(prompt)
             if response and "NO_NOTIFICATION" not in response:
@@ -152,7 +223,7 @@ class HeartbeatScheduler:
             from src.heartbeat.gmail import fetch_unread_emails
 
             context = self._get_user_context()
-            parts = [context, "\n\n## Daily Summary Request\n"]
+            parts = [context, "", "## Daily Summary Request", ""]
 
             try:
                 events = fetch_upcoming_events(
@@ -194,7 +265,16 @@ class HeartbeatScheduler:
         return None
 
     def _get_user_context(self) -> str:
-        """Load SOUL.md and USER.md content for context."""
+        """Load SOUL.md and USER.md content for context.
+
+        Memoized on the files' mtimes; ticks between edits return the
+        cached joined string.
+        """
+        mtimes = (self._stat_mtime("SOUL.md"), self._stat_mtime("USER.md"))
+        cached = self._context_cache
+        if cached is not None and cached[0] == mtimes:
+            return cached[1]
+
         parts = []
         soul = self._memory.get_file_content("SOUL.md")
         if soul:
@@ -202,31 +282,29 @@ class HeartbeatScheduler:
         user = self._memory.get_file_content("USER.md")
         if user:
             parts.append(user)
-        return "\n\n".join(parts) if parts else ""
+        context = "\n\n".join(parts) if parts else ""
+        self._context_cache = (mtimes, context)
+        return context
+
+    def _stat_mtime(self, filename: str) -> float | None:
+        try:
+            return (self._memory.memory_dir / filename).stat().st_mtime
+        except (OSError, TypeError):
+            return None
 
     @staticmethod
     def _format_emails(emails: list[dict]) -> str:
-        lines = []
-        for e in emails:
-            lines.append(f"- **From:** {e['sender']}")
-            lines.append(f"  **Subject:** {e['subject']}")
-            lines.append(f"  **Preview:** {e['snippet'][:200]}")
-            lines.append("")
-        return "\n".join(lines)
+        return "\n".join(_EMAIL_TMPL.format_map(e) for e in emails)
 
     @staticmethod
     def _format_events(events: list[dict]) -> str:
-        lines = []
-        for e in events:
-            lines.append(f"- **{e['title']}**")
-            lines.append(f"  {e['start_time']} - {e['end_time']}")
-            if e.get("location"):
-                lines.append(f"  Location: {e['location']}")
-            lines.append("")
-        return "\n".join(lines)
+        return "\n".join(
+            (_EVENT_LOC_TMPL if e.get("location") else _EVENT_TMPL).format_map(e)
+            for e in events
+        )
 
     @staticmethod
     def _parse_time(time_str: str) -> tuple[int, int]:
         """Parse a time string like '08:00' into (hour, minute)."""
-        parts = time_str.split(":")
-        return int(parts[0]), int(parts[1]) if len(parts) > 1 else 0
+        hour, _, minute = time_str.partition(":")
+        return int(hour), int(minute) if minute else 0
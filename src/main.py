@@ -21,12 +21,14 @@ def _init_memory(config: Config) -> "MemoryManager":
     from src.memory.manager import MemoryManager
 
     db_dir = Path(config.memory.db_path).parent
-    db_dir.mkdir(parents=True, exist_ok=True)
+    if not db_dir.exists():
+        db_dir.mkdir(parents=True, exist_ok=True)
 
     mm = MemoryManager(
         memory_dir=config.memory.dir,
         db_path=config.memory.db_path,
         embedding_model=config.memory.embedding_model,
+        embedding_dim=config.memory.embedding_dim,
         chunk_tokens=config.memory.chunk_tokens,
         chunk_overlap=config.memory.chunk_overlap,
         search_top_k=config.memory.search_top_k,
@@ -83,7 +85,7 @@ def _init_heartbeat(config: Config, memory_manager, notifier, agent):
 
 def _init_notifier(config: Config, registry):
     from src.heartbeat.notifier import Notifier
-    return Notifier(config=config, adapter_registry=registry)
+    return Notifier(config=config.notifications, adapter_registry=registry)
 
 
 def _run_chat(config: Config) -> None:
@@ -94,6 +96,12 @@ def _run_chat(config: Config) -> None:
     notifier = _init_notifier(config, registry)
     agent = _init_agent(config, memory, skills, notifier)
 
+    # Keep the agent's skills (and its cached prompt prefix) in sync with
+    # edits to the skills directory.
+    from src.skills.loader import SkillWatcher
+    skill_watcher = SkillWatcher(config.skills.dir, on_update=agent.update_skills)
+    skill_watcher.start()
+
     # Start heartbeat if enabled
     scheduler = None
     if config.heartbeat.enabled:
@@ -122,6 +130,7 @@ def _run_chat(config: Config) -> None:
     except KeyboardInterrupt:
         pass
     finally:
+        skill_watcher.stop()
         if scheduler:
             scheduler.stop()
         session_mgr.log_and_close(
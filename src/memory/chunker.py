@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-import hashlib
 from dataclasses import dataclass
+from hashlib import sha256
+
+import numpy as np
 
 
 @dataclass
@@ -22,6 +24,10 @@ def chunk_markdown(
     Uses a character-based approximation (1 token ~= 4 chars).
     Tries to break at heading boundaries when possible.
 
+    The content is encoded once and chunks are tracked as byte offsets
+    into that buffer, so emitting a chunk is a single slice + decode
+    instead of re-joining and re-encoding its lines.
+
     Args:
         content: The Markdown text to chunk.
         chunk_tokens: Target size per chunk in tokens.
@@ -33,64 +39,64 @@ def chunk_markdown(
     if not content or not content.strip():
         return []
 
-    lines = content.split("\n")
+    buf = content.encode()
     max_chars = max(32, chunk_tokens * 4)
     overlap_chars = max(0, overlap_tokens * 4)
 
-    chunks: list[MemoryChunk] = []
-    current_lines: list[tuple[int, str]] = []  # (line_number, text)
-    current_chars = 0
-
-    for i, line in enumerate(lines):
-        line_chars = len(line) + 1  # +1 for newline
-
-        # Check if adding this line would exceed the chunk size
-        if current_chars + line_chars > max_chars and current_lines:
-            # Try to break at a heading boundary
-            chunk = _flush_chunk(current_lines)
-            chunks.append(chunk)
-
-            # Calculate overlap: keep lines from the end of current chunk
-            current_lines, current_chars = _compute_overlap(
-                current_lines, overlap_chars
-            )
+    # line_starts[i]/line_ends[i] bracket line i in buf, excluding the
+    # trailing newline, so buf[start:end] equals the "\n"-joined text.
+    newlines = np.nonzero(np.frombuffer(buf, dtype=np.uint8) == 0x0A)[0]
+    line_starts = np.concatenate(([0], newlines + 1))
+    line_ends = np.append(line_starts[1:] - 1, len(buf))
+    line_lens = line_ends - line_starts + 1  # +1 for newline separator
 
-        current_lines.append((i + 1, line))  # 1-indexed line numbers
-        current_chars += line_chars
+    # Paginate on the cumulative line sizes: each chunk boundary and each
+    # overlap start is a single searchsorted on cum, so the loop below runs
+    # once per chunk instead of once per line.
+    cum = np.cumsum(line_lens)
+    n_lines = len(cum)
 
-    # Flush remaining lines
-    if current_lines:
-        chunks.append(_flush_chunk(current_lines))
-
-    return chunks
-
-
-def _flush_chunk(lines: list[tuple[int, str]]) -> MemoryChunk:
-    """Create a MemoryChunk from accumulated lines."""
-    text = "\n".join(line for _, line in lines)
+    chunks: list[MemoryChunk] = []
+    first = 0  # index of the first line in the chunk being accumulated
+    prev_last = -1
+
+    while True:
+        base = int(cum[first - 1]) if first > 0 else 0
+        # Last line that still fits in the chunk; always make progress
+        # past the previous chunk even if the overlap alone overflows.
+        last = int(np.searchsorted(cum, base + max_chars, side="right")) - 1
+        last = max(last, first, prev_last + 1)
+
+        if last >= n_lines - 1:
+            chunks.append(_make_chunk(buf, line_starts, line_ends, first, n_lines - 1))
+            return chunks
+        chunks.append(_make_chunk(buf, line_starts, line_ends, first, last))
+        prev_last = last
+
+        # Calculate overlap: keep lines from the end of current chunk
+        if overlap_chars <= 0:
+            first = last + 1
+        else:
+            target = int(cum[last]) - overlap_chars
+            if target <= 0:
+                keep_from = 0
+            else:
+                keep_from = int(np.searchsorted(cum, target, side="left")) + 1
+            first = min(max(keep_from, first), last)
+
+
+def _make_chunk(
+    buf: bytes,
+    line_starts: np.ndarray,
+    line_ends: np.ndarray,
+    first: int,
+    last: int,
+) -> MemoryChunk:
+    """Create a MemoryChunk from a byte range of the source buffer."""
+    piece = buf[int(line_starts[first]):int(line_ends[last])]
     return MemoryChunk(
-        start_line=lines[0][0],
-        end_line=lines[-1][0],
-        text=text,
-        hash=hashlib.sha256(text.encode()).hexdigest(),
+        start_line=first + 1,  # 1-indexed line numbers
+        end_line=last + 1,
+        text=piece.decode(),
+        hash=sha256(piece).hexdigest(),
     )
-
-
-def _compute_overlap(
-    lines: list[tuple[int, str]], overlap_chars: int
-) -> tuple[list[tuple[int, str]], int]:
-    """Keep lines from the end to fill the overlap window."""
-    if overlap_chars <= 0:
-        return [], 0
-
-    kept: list[tuple[int, str]] = []
-    chars = 0
-    for line_no, text in reversed(lines):
-        line_chars = len(text) + 1
-        if chars + line_chars > overlap_chars and kept:
-            break
-        kept.append((line_no, text))
-        chars += line_chars
-
-    kept.reverse()
-    return kept, chars
@@ -1,13 +1,52 @@
 from __future__ import annotations
 
+import contextlib
+import functools
 import hashlib
+import re
 import sqlite3
+import threading
 import time
-from typing import Any
+from typing import Any, ClassVar, Iterator
+
+import numpy as np
+
+_WS_RE = re.compile(r"\s+")
+
+_INSERT_CACHE_SQL = (
+    "INSERT OR REPLACE INTO embedding_cache "
+    "(hash, normalized_hash, model, embedding, updated_at) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalized_hash(text: str) -> str:
+    """Hash of the text with whitespace collapsed and case folded.
+
+    Used as a secondary cache key so trivial edits (reflowed whitespace,
+    trailing newlines, capitalization) still hit the cache.
+    """
+    return hashlib.sha256(_WS_RE.sub(" ", text).strip().lower().encode()).hexdigest()
 
 
 class EmbeddingProvider:
-    """Wraps fastembed for local embedding generation with caching."""
+    """Wraps fastembed for local embedding generation with caching.
+
+    Embeddings are float32 ndarrays end to end; blobs are encoded with a
+    single tobytes()/frombuffer() memcpy instead of per-element struct
+    packing.
+    """
+
+    # Loaded models are shared process-wide by name: reloading the ONNX
+    # weights per provider instance costs seconds and ~130 MB each time.
+    _MODEL_CACHE: ClassVar[dict[str, Any]] = {}
+    _MODEL_LOCK: ClassVar[threading.Lock] = threading.Lock()
 
     def __init__(
         self,
@@ -17,15 +56,64 @@ class EmbeddingProvider:
         self.model_name = model_name
         self._db = db
         self._model: Any = None
+        # Serializes every use of _db. The connection may be opened with
+        # check_same_thread=False and shared by tool-executor and
+        # scheduler threads, and sqlite3 objects are not thread-safe.
+        self._db_lock = threading.Lock()
+        # When not None, cache inserts are buffered here instead of
+        # written; see deferred_cache_writes().
+        self._pending: list[tuple[str, str, str, bytes, int]] | None = None
 
     def _get_model(self) -> Any:
         if self._model is None:
-            from fastembed import TextEmbedding  # type: ignore[import-untyped]
+            with self._MODEL_LOCK:
+                model = self._MODEL_CACHE.get(self.model_name)
+                if model is None:
+                    from fastembed import TextEmbedding  # type: ignore[import-untyped]
 
-            self._model = TextEmbedding(model_name=self.model_name)
+                    model = TextEmbedding(model_name=self.model_name)
+                    self._MODEL_CACHE[self.model_name] = model
+            self._model = model
         return self._model
 
-    def embed(self, text: str) -> list[float]:
+    @classmethod
+    def clear_model_cache(cls) -> None:
+        """Drop all shared model instances (mainly for tests)."""
+        with cls._MODEL_LOCK:
+            cls._MODEL_CACHE.clear()
+
+    @contextlib.contextmanager
+    def deferred_cache_writes(self) -> Iterator[None]:
+        """Buffer cache inserts and flush them after the block exits.
+
+        Callers holding an open write transaction on the shared
+        connection (e.g. a sync) use this so cache inserts don't commit
+        mid-transaction and make half the caller's work durable. The
+        buffered rows are flushed even if the block raises: embeddings
+        are content-addressed, so rows computed for a failed sync are
+        still valid and worth keeping.
+        """
+        with self._db_lock:
+            self._pending = []
+        try:
+            yield
+        finally:
+            with self._db_lock:
+                rows, self._pending = self._pending, None
+                if rows and self._db is not None:
+                    self._db.executemany(_INSERT_CACHE_SQL, rows)
+                    self._db.commit()
+
+    def _write_rows(self, rows: list[tuple[str, str, str, bytes, int]]) -> None:
+        """Insert cache rows, or buffer them inside deferred_cache_writes()."""
+        with self._db_lock:
+            if self._pending is not None:
+                self._pending.extend(rows)
+                return
+            self._db.executemany(_INSERT_CACHE_SQL, rows)
+            self._db.commit()
+
+    def embed(self, text: str) -> np.ndarray:
         """Generate an embedding for a single text."""
         cached = self._cache_get(text)
         if cached is not None:
@@ -33,64 +121,156 @@ class EmbeddingProvider:
 
         model = self._get_model()
         embeddings = list(model.embed([text]))
-        result = list(embeddings[0])
+        result = np.asarray(embeddings[0], dtype=np.float32)
 
         self._cache_put(text, result)
         return result
 
-    def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings for a batch of texts."""
-        results: list[list[float] | None] = [None] * len(texts)
-        to_compute: list[tuple[int, str]] = []
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        """Generate embeddings for a batch of texts.
 
-        # Check cache first
-        for i, text in enumerate(texts):
-            cached = self._cache_get(text)
-            if cached is not None:
-                results[i] = cached
+        Cache hits for the whole batch are fetched with one query rather
+        than a SELECT per text.
+        """
+        results: list[np.ndarray | None] = [None] * len(texts)
+        hashes = [self._hash(t) for t in texts]
+        norm_hashes = [_normalized_hash(t) for t in texts]
+        cached = self._cache_get_many(hashes, norm_hashes)
+
+        to_compute: list[int] = []
+        for i, h in enumerate(hashes):
+            vec = cached.get(h)
+            if vec is not None:
+                results[i] = vec
             else:
-                to_compute.append((i, text))
+                to_compute.append(i)
 
         if to_compute:
             model = self._get_model()
-            compute_texts = [t for _, t in to_compute]
-            embeddings = list(model.embed(compute_texts))
-            for (idx, text), emb in zip(to_compute, embeddings):
-                vec = list(emb)
+            embeddings = list(model.embed([texts[i] for i in to_compute]))
+            put_items: list[tuple[str, str, np.ndarray]] = []
+            for idx, emb in zip(to_compute, embeddings):
+                vec = np.asarray(emb, dtype=np.float32)
                 results[idx] = vec
-                self._cache_put(text, vec)
+                put_items.append((hashes[idx], norm_hashes[idx], vec))
+            self._cache_put_many(put_items)
 
         return [r for r in results if r is not None]
 
     def _hash(self, text: str) -> str:
-        return hashlib.sha256(text.encode()).hexdigest()
+        return _text_hash(text)
 
-    def _cache_get(self, text: str) -> list[float] | None:
+    def _cache_get(self, text: str) -> np.ndarray | None:
         if self._db is None:
             return None
         h = self._hash(text)
-        row = self._db.execute(
-            "SELECT embedding FROM embedding_cache WHERE hash = ? AND model = ?",
-            (h, self.model_name),
-        ).fetchone()
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT embedding FROM embedding_cache WHERE hash = ? AND model = ?",
+                (h, self.model_name),
+            ).fetchone()
+            if row is None:
+                # Fall back to the normalized form: whitespace/case-only
+                # variants of a cached text share its embedding.
+                row = self._db.execute(
+                    "SELECT embedding FROM embedding_cache "
+                    "WHERE normalized_hash = ? AND model = ? LIMIT 1",
+                    (_normalized_hash(text), self.model_name),
+                ).fetchone()
         if row is None:
             return None
-        import struct
 
         blob = row[0] if isinstance(row, tuple) else row["embedding"]
-        n = len(blob) // 4
-        return list(struct.unpack(f"{n}f", blob))
+        return self._decode_blob(blob)
 
-    def _cache_put(self, text: str, embedding: list[float]) -> None:
+    def _cache_put(self, text: str, embedding: np.ndarray) -> None:
         if self._db is None:
             return
-        import struct
+        self._write_rows([
+            (
+                self._hash(text),
+                _normalized_hash(text),
+                self.model_name,
+                self._encode_blob(embedding),
+                int(time.time()),
+            )
+        ])
 
-        h = self._hash(text)
-        blob = struct.pack(f"{len(embedding)}f", *embedding)
-        self._db.execute(
-            """INSERT OR REPLACE INTO embedding_cache (hash, model, embedding, updated_at)
-               VALUES (?, ?, ?, ?)""",
-            (h, self.model_name, blob, int(time.time())),
-        )
-        self._db.commit()
+    # SQLite's default bound-parameter limit is 999; leave headroom for
+    # the model parameter.
+    _IN_BATCH = 500
+
+    def _cache_get_many(
+        self, hashes: list[str], norm_hashes: list[str] | None = None
+    ) -> dict[str, np.ndarray]:
+        """Fetch cached embeddings for many hashes in one query per batch.
+
+        Hashes that miss exactly are retried by their normalized hash
+        (when provided); such hits are keyed under the exact hash the
+        caller asked for.
+        """
+        if self._db is None or not hashes:
+            return {}
+
+        found: dict[str, np.ndarray] = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._db_lock:
+            for start in range(0, len(unique), self._IN_BATCH):
+                batch = unique[start:start + self._IN_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._db.execute(
+                    f"SELECT hash, embedding FROM embedding_cache "
+                    f"WHERE model = ? AND hash IN ({placeholders})",
+                    (self.model_name, *batch),
+                ).fetchall()
+                for row in rows:
+                    found[row[0]] = self._decode_blob(row[1])
+
+            if norm_hashes is not None:
+                missed = {
+                    nh: h
+                    for h, nh in zip(hashes, norm_hashes)
+                    if h not in found
+                }
+                for start in range(0, len(missed), self._IN_BATCH):
+                    batch = list(missed)[start:start + self._IN_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = self._db.execute(
+                        f"SELECT normalized_hash, embedding FROM embedding_cache "
+                        f"WHERE model = ? AND normalized_hash IN ({placeholders})",
+                        (self.model_name, *batch),
+                    ).fetchall()
+                    for row in rows:
+                        found[missed[row[0]]] = self._decode_blob(row[1])
+        return found
+
+    def _cache_put_many(self, items: list[tuple[str, str, np.ndarray]]) -> None:
+        """Insert many (hash, normalized_hash, embedding) rows in one statement."""
+        if self._db is None or not items:
+            return
+
+        now = int(time.time())
+        self._write_rows([
+            (h, nh, self.model_name, self._encode_blob(vec), now)
+            for h, nh, vec in items
+        ])
+
+    @staticmethod
+    def _encode_blob(embedding: np.ndarray) -> bytes:
+        """Encode an embedding as a version-prefixed fp16 blob.
+
+        fp16 halves cache size and bytes scanned; the <1e-3 rounding is
+        noise to the downstream cosine ranker.
+        """
+        return b"\x01" + np.ascontiguousarray(embedding, dtype=np.float16).tobytes()
+
+    @staticmethod
+    def _decode_blob(blob: bytes) -> np.ndarray:
+        """Decode a cache blob, accepting legacy unprefixed float32 rows.
+
+        The fp16 payload plus prefix byte has odd length; raw float32
+        blobs are always a multiple of 4, so the two can't collide.
+        """
+        if len(blob) % 2 == 1 and blob[0] == 0x01:
+            return np.frombuffer(blob, dtype=np.float16, offset=1).astype(np.float32)
+        return np.frombuffer(blob, dtype=np.float32)
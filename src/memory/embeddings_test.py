@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import sqlite3
-import struct
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -47,9 +46,21 @@ class TestEmbeddingProvider:
         # embed is not called again because cache returns it
         assert provider._model.embed.call_count == 1
         assert len(result1) == len(result2)
-        # Allow for float32 precision loss from struct pack/unpack
+        # Allow for float16 precision loss in the cache blobs
         for a, b in zip(result1, result2):
-            assert abs(a - b) < 1e-6
+            assert abs(a - b) < 1e-3
+        conn.close()
+
+    def test_cache_hits_on_whitespace_variant(self, tmp_path: Path) -> None:
+        conn = ensure_schema(tmp_path / "test.db")
+        provider = _mock_embedding_provider(db=conn)
+
+        provider.embed("Hello   world")
+        assert provider._model.embed.call_count == 1
+
+        # Whitespace/case variants share the normalized cache key
+        provider.embed("hello world\n")
+        assert provider._model.embed.call_count == 1
         conn.close()
 
     def test_cache_miss_for_different_text(self, tmp_path: Path) -> None:
@@ -76,6 +87,37 @@ class TestEmbeddingProvider:
         assert provider._model.embed.call_count == 2
         conn.close()
 
+    def test_deferred_cache_writes_flush_after_block(self, tmp_path: Path) -> None:
+        conn = ensure_schema(tmp_path / "test.db")
+        provider = _mock_embedding_provider(db=conn)
+
+        with provider.deferred_cache_writes():
+            provider.embed("hello")
+            # Nothing touches the DB while the block is open
+            count = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+            assert count == 0
+
+        count = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        assert count == 1
+        conn.close()
+
+    def test_deferred_cache_writes_flush_on_error(self, tmp_path: Path) -> None:
+        conn = ensure_schema(tmp_path / "test.db")
+        provider = _mock_embedding_provider(db=conn)
+
+        try:
+            with provider.deferred_cache_writes():
+                provider.embed("hello")
+                raise RuntimeError("sync failed")
+        except RuntimeError:
+            pass
+
+        # Embeddings are content-addressed, so rows computed before the
+        # failure are kept
+        count = conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        assert count == 1
+        conn.close()
+
     def test_no_cache_without_db(self) -> None:
         provider = _mock_embedding_provider(db=None)
         result1 = provider.embed("hello")
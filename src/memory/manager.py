@@ -1,17 +1,49 @@
 from __future__ import annotations
 
+import atexit
 import hashlib
+import os
 import sqlite3
-import struct
+import threading
 import time
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
+
+import numpy as np
+
+try:
+    import xxhash  # type: ignore[import-untyped]
+except ImportError:
+    xxhash = None
 
 from src.memory.chunker import chunk_markdown
 from src.memory.embeddings import EmbeddingProvider
-from src.memory.schema import ensure_schema
-from src.memory.search import SearchResult, search_hybrid
+from src.memory.schema import ensure_schema, get_cache_conn, get_read_conn
+from src.memory.search import SearchResult, quantize_int8, search_hybrid
+
+
+def _fast_hash(data: bytes) -> str:
+    """Hash file bytes for change detection.
+
+    files.hash only answers "did this file change since last index", so
+    collision resistance is irrelevant and xxh3 (roughly memcpy speed)
+    is used when installed. The sha256 fallback just means a one-time
+    re-index if the installed hasher ever changes. Chunk hashes stay
+    sha256 since they key embedding reuse.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+# Statement text for the hot insert paths lives at module scope so the
+# strings (and sqlite3's per-string statement cache entry) are reused
+# across _index_file calls.
+_INSERT_CHUNK_SQL = """INSERT INTO chunks (id, path, start_line, end_line, hash, model, text, embedding, updated_at)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+_INSERT_FTS_SQL = "INSERT INTO chunks_fts (id, text) VALUES (?, ?)"
+_INSERT_VEC_SQL = "INSERT INTO chunks_vec (id, embedding) VALUES (?, ?)"
 
 
 class MemoryManager:
@@ -27,6 +59,7 @@ class MemoryManager:
         memory_dir: str | Path,
         db_path: str | Path,
         embedding_model: str = "BAAI/bge-small-en-v1.5",
+        embedding_dim: int = 384,
         chunk_tokens: int = 2000,
         chunk_overlap: int = 200,
         search_top_k: int = 5,
@@ -35,18 +68,39 @@ class MemoryManager:
     ) -> None:
         self.memory_dir = Path(memory_dir)
         self.db_path = Path(db_path)
+        self.embedding_dim = embedding_dim
         self.chunk_tokens = chunk_tokens
         self.chunk_overlap = chunk_overlap
         self.search_top_k = search_top_k
         self.vector_weight = vector_weight
         self.text_weight = text_weight
 
-        self._conn = ensure_schema(self.db_path)
+        self._conn = ensure_schema(self.db_path, embedding_dim)
+        # Probe the optional virtual tables once so the index/remove
+        # paths can branch on a flag instead of catching
+        # OperationalError per statement.
+        names = {
+            row[0]
+            for row in self._conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE name IN ('chunks_fts', 'chunks_vec')"
+            )
+        }
+        self._has_fts = "chunks_fts" in names
+        self._has_vec = "chunks_vec" in names
+        # The embedder gets its own cross-thread connection (serialized
+        # by its internal lock) so tool-executor and heartbeat threads
+        # can embed without tripping sqlite3's same-thread check on the
+        # writer connection above.
+        self._cache_conn = get_cache_conn(self.db_path)
         self._embedder = EmbeddingProvider(
             model_name=embedding_model,
-            db=self._conn,
+            db=self._cache_conn,
         )
         self._watcher: Any = None
+        self._watch_handler: Any = None
+        # filename -> (mtime, content); invalidated when the file changes.
+        self._file_cache: dict[str, tuple[float, str]] = {}
 
     def sync(self) -> dict[str, int]:
         """Scan memory directory and sync changes to the database.
@@ -57,43 +111,142 @@ class MemoryManager:
 
         # List all .md files in the memory directory
         disk_files = self._list_md_files()
-        disk_paths = {str(p) for p in disk_files}
+        disk_paths = {str(p) for p, _ in disk_files}
 
         # Get known files from DB
         db_rows = self._conn.execute("SELECT path, hash FROM files").fetchall()
         db_files = {row[0]: row[1] for row in db_rows}
 
-        # Detect deleted files
-        for db_path in db_files:
-            if db_path not in disk_paths:
-                self._remove_file(db_path)
-                stats["deleted"] += 1
+        # Read and hash in worker threads (both release the GIL); DB
+        # writes stay on this thread since SQLite is single-writer.
+        scans = self._scan_disk(disk_files, db_files)
 
-        # Detect new and changed files
-        for file_path in disk_files:
-            rel_path = str(file_path)
-            content = file_path.read_text(encoding="utf-8")
-            content_hash = hashlib.sha256(content.encode()).hexdigest()
+        # One transaction for the whole sync; per-statement autocommit
+        # fsyncs dominate multi-file syncs otherwise. Embedding-cache
+        # writes are deferred past the transaction so a rollback can't
+        # leave a files row committed without its chunks.
+        with self._embedder.deferred_cache_writes(), self._conn:
+            # Detect deleted files
+            for db_path in db_files:
+                if db_path not in disk_paths:
+                    self._remove_file(db_path)
+                    stats["deleted"] += 1
+
+            self._apply_scans(scans, db_files, stats)
+
+        return stats
+
+    def _sync_paths(self, paths: set[str]) -> dict[str, int]:
+        """Sync only the given file paths instead of rescanning the tree.
+
+        Used by the file watcher so an edit storm costs O(touched files)
+        rather than a full-directory sync per debounce window.
+        """
+        stats = {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+        md_paths = sorted(p for p in paths if p.endswith(".md"))
+        if not md_paths:
+            return stats
+
+        present: list[tuple[Path, os.stat_result]] = []
+        missing: list[str] = []
+        for p in md_paths:
+            try:
+                present.append((Path(p), os.stat(p)))
+            except OSError:
+                missing.append(p)
+
+        placeholders = ",".join("?" * len(md_paths))
+        db_files = {
+            row[0]: row[1]
+            for row in self._conn.execute(
+                f"SELECT path, hash FROM files WHERE path IN ({placeholders})",
+                md_paths,
+            )
+        }
+        scans = self._scan_disk(present, db_files)
 
-            if rel_path not in db_files:
-                self._index_file(file_path, rel_path, content, content_hash)
+        with self._embedder.deferred_cache_writes(), self._conn:
+            for p in missing:
+                if p in db_files:
+                    self._remove_file(p)
+                    stats["deleted"] += 1
+
+            self._apply_scans(scans, db_files, stats)
+
+        return stats
+
+    def _apply_scans(
+        self,
+        scans: list[tuple[str, str, str | None, os.stat_result]],
+        db_files: dict[str, str],
+        stats: dict[str, int],
+    ) -> None:
+        """Index new/changed scan results; must run inside a transaction."""
+        for rel_path, content_hash, content, stat in scans:
+            if content is None:
+                stats["unchanged"] += 1
+            elif rel_path not in db_files:
+                self._index_file(rel_path, content, content_hash, stat)
                 stats["added"] += 1
-            elif db_files[rel_path] != content_hash:
+            else:
+                # Keep the old chunks' embedding blobs by hash so
+                # re-indexing only embeds chunks whose text changed.
+                prior = {
+                    row[0]: row[1]
+                    for row in self._conn.execute(
+                        "SELECT hash, embedding FROM chunks WHERE path = ?",
+                        (rel_path,),
+                    )
+                }
                 self._remove_file(rel_path)
-                self._index_file(file_path, rel_path, content, content_hash)
+                self._index_file(rel_path, content, content_hash, stat, prior)
                 stats["updated"] += 1
-            else:
-                stats["unchanged"] += 1
 
-        self._conn.commit()
-        return stats
+    def _scan_disk(
+        self, files: list[tuple[Path, os.stat_result]], db_files: dict[str, str]
+    ) -> list[tuple[str, str, str | None, os.stat_result]]:
+        """Hash files in parallel, decoding only the ones that changed.
+
+        Returns (rel_path, hash, content, stat) tuples in input order;
+        content is None when the hash matches what the DB already has.
+        """
+
+        def scan_one(
+            item: tuple[Path, os.stat_result]
+        ) -> tuple[str, str, str | None, os.stat_result]:
+            file_path, stat = item
+            rel_path = str(file_path)
+            data = file_path.read_bytes()
+            content_hash = _fast_hash(data)
+            if db_files.get(rel_path) == content_hash:
+                return (rel_path, content_hash, None, stat)
+            return (rel_path, content_hash, data.decode("utf-8"), stat)
+
+        if len(files) <= 1:
+            return [scan_one(item) for item in files]
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            return list(pool.map(scan_one, files))
+
+    def _search_conn(self):
+        """Connection to run search queries on.
+
+        Searches go through a per-thread read-only connection so
+        concurrent callers parallelize under WAL instead of serializing
+        on the shared writer connection. Falls back to the writer
+        connection if the read-only open fails.
+        """
+        try:
+            return get_read_conn(self.db_path)
+        except sqlite3.OperationalError:
+            return self._conn
 
     def search(self, query: str, top_k: int | None = None) -> list[SearchResult]:
         """Search memory using hybrid vector + keyword search."""
         k = top_k or self.search_top_k
         query_embedding = self._embedder.embed(query)
         return search_hybrid(
-            self._conn,
+            self._search_conn(),
             query_text=query,
             query_embedding=query_embedding,
             top_k=k,
@@ -101,9 +254,41 @@ class MemoryManager:
             text_weight=self.text_weight,
         )
 
+    def embed_text(self, text: str) -> np.ndarray:
+        """Embed a single text with the configured embedding model."""
+        return self._embedder.embed(text)
+
     def get_context(self, query: str, top_k: int | None = None) -> str:
         """Search memory and return formatted context for the agent prompt."""
-        results = self.search(query, top_k)
+        return self._format_context(self.search(query, top_k))
+
+    def get_context_batch(self, queries: list[str], top_k: int | None = None) -> list[str]:
+        """Batched get_context: embed all queries in one forward pass.
+
+        Useful when several pending queries (e.g. a burst of heartbeat
+        checks) would otherwise each pay full embedding latency.
+        """
+        if not queries:
+            return []
+        k = top_k or self.search_top_k
+        embeddings = self._embedder.embed_batch(queries)
+        conn = self._search_conn()
+        contexts = []
+        for query, embedding in zip(queries, embeddings):
+            results = search_hybrid(
+                conn,
+                query_text=query,
+                query_embedding=embedding,
+                top_k=k,
+                vector_weight=self.vector_weight,
+                text_weight=self.text_weight,
+            )
+            contexts.append(self._format_context(results))
+        return contexts
+
+    @staticmethod
+    def _format_context(results: list[SearchResult]) -> str:
+        """Format search results as a prompt section."""
         if not results:
             return ""
 
@@ -116,15 +301,31 @@ class MemoryManager:
         return "\n".join(parts)
 
     def get_file_content(self, filename: str) -> str | None:
-        """Read a specific memory file's content (e.g., SOUL.md)."""
+        """Read a specific memory file's content (e.g., SOUL.md).
+
+        Contents are cached keyed on mtime, so repeated prompt builds only
+        pay a stat() until the file actually changes.
+        """
         file_path = self.memory_dir / filename
-        if file_path.exists():
-            return file_path.read_text(encoding="utf-8")
-        return None
+        try:
+            mtime = file_path.stat().st_mtime
+        except OSError:
+            return None
+        cached = self._file_cache.get(filename)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        content = file_path.read_text(encoding="utf-8")
+        self._file_cache[filename] = (mtime, content)
+        return content
 
     def close(self) -> None:
-        """Close the database connection and stop any file watchers."""
+        """Close the database connections and stop any file watchers."""
         self.stop_watching()
+        self._cache_conn.close()
+        # Refresh planner stats while the work done this session is
+        # still representative; recommended before closing long-lived
+        # connections.
+        self._conn.execute("PRAGMA optimize")
         self._conn.close()
 
     def start_watching(self, debounce_seconds: float = 5.0) -> None:
@@ -138,43 +339,98 @@ class MemoryManager:
         manager = self
 
         class _Handler(FileSystemEventHandler):
+            """Collects dirty paths and syncs just those after a quiet period."""
+
             def __init__(self) -> None:
-                self._last_sync = 0.0
-                self._debounce = debounce_seconds
+                self._dirty: set[str] = set()
+                self._timer: threading.Timer | None = None
+                self._lock = threading.Lock()
 
             def on_any_event(self, event: Any) -> None:
-                if not event.src_path.endswith(".md"):
-                    return
-                now = time.time()
-                if now - self._last_sync < self._debounce:
+                touched = [
+                    p
+                    for p in (event.src_path, getattr(event, "dest_path", ""))
+                    if p and p.endswith(".md")
+                ]
+                if not touched:
                     return
-                self._last_sync = now
-                manager.sync()
-
+                with self._lock:
+                    self._dirty.update(touched)
+                    if self._timer is None:
+                        self._timer = threading.Timer(debounce_seconds, self._flush)
+                        self._timer.daemon = True
+                        self._timer.start()
+
+            def _flush(self) -> None:
+                with self._lock:
+                    dirty, self._dirty = self._dirty, set()
+                    self._timer = None
+                if dirty:
+                    manager._sync_paths(dirty)
+
+            def cancel(self) -> None:
+                with self._lock:
+                    if self._timer is not None:
+                        self._timer.cancel()
+                        self._timer = None
+
+        handler = _Handler()
         observer = Observer()
-        observer.schedule(_Handler(), str(self.memory_dir), recursive=True)
+        observer.schedule(handler, str(self.memory_dir), recursive=True)
         observer.daemon = True
         observer.start()
         self._watcher = observer
+        self._watch_handler = handler
 
     def stop_watching(self) -> None:
         """Stop the file watcher if running."""
         if self._watcher is not None:
             self._watcher.stop()
             self._watcher = None
+        if self._watch_handler is not None:
+            self._watch_handler.cancel()
+            self._watch_handler = None
 
-    def _list_md_files(self) -> list[Path]:
-        """List all .md files in the memory directory."""
-        if not self.memory_dir.exists():
-            return []
-        files = list(self.memory_dir.rglob("*.md"))
-        return sorted(files)
+    def _list_md_files(self) -> list[tuple[Path, os.stat_result]]:
+        """List all .md files in the memory directory with their stats.
+
+        Walks with os.scandir, which gets file/dir type from the dirent
+        where the OS provides it and caches the stat, so each file costs
+        one readdir entry instead of the extra stat calls rglob incurs.
+        """
+        files: list[tuple[Path, os.stat_result]] = []
+        stack = [str(self.memory_dir)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".md") and entry.is_file(
+                        follow_symlinks=False
+                    ):
+                        files.append((Path(entry.path), entry.stat()))
+        files.sort(key=lambda item: item[0])
+        return files
 
     def _index_file(
-        self, abs_path: Path, rel_path: str, content: str, content_hash: str
+        self,
+        rel_path: str,
+        content: str,
+        content_hash: str,
+        stat: os.stat_result,
+        prior: dict[str, bytes] | None = None,
     ) -> None:
-        """Index a single file: chunk, embed, and store."""
-        stat = abs_path.stat()
+        """Index a single file: chunk, embed, and store.
+
+        ``prior`` maps chunk hash -> embedding blob from a previous
+        version of the file; chunks whose text is unchanged reuse the
+        blob instead of being re-embedded (append-heavy edits typically
+        keep most chunks byte-identical).
+        """
         self._conn.execute(
             "INSERT OR REPLACE INTO files (path, hash, mtime, size) VALUES (?, ?, ?, ?)",
             (rel_path, content_hash, stat.st_mtime, stat.st_size),
@@ -183,70 +439,106 @@ class MemoryManager:
         chunks = chunk_markdown(content, self.chunk_tokens, self.chunk_overlap)
         now = int(time.time())
 
-        texts = [c.text for c in chunks]
-        embeddings = self._embedder.embed_batch(texts) if texts else []
-
-        for chunk, embedding in zip(chunks, embeddings):
-            chunk_id = str(uuid.uuid4())
-            emb_blob = struct.pack(f"{len(embedding)}f", *embedding)
-
-            self._conn.execute(
-                """INSERT INTO chunks (id, path, start_line, end_line, hash, model, text, embedding, updated_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        prior = prior or {}
+        to_embed = [c.text for c in chunks if c.hash not in prior]
+        embeddings = iter(self._embedder.embed_batch(to_embed) if to_embed else [])
+
+        # One urandom call covers every chunk id; hex slices are cheaper
+        # than a uuid.uuid4() round-trip per chunk and 4 bytes shorter.
+        rand_hex = os.urandom(16 * len(chunks)).hex()
+
+        chunk_rows = []
+        fts_rows = []
+        vec_rows = []
+        for i, chunk in enumerate(chunks):
+            chunk_id = rand_hex[i * 32:(i + 1) * 32]
+            emb_blob = prior.get(chunk.hash)
+            if emb_blob is None:
+                emb_blob = np.ascontiguousarray(
+                    next(embeddings), dtype=np.float32
+                ).tobytes()
+            chunk_rows.append(
                 (chunk_id, rel_path, chunk.start_line, chunk.end_line,
-                 chunk.hash, self._embedder.model_name, chunk.text, emb_blob, now),
+                 chunk.hash, self._embedder.model_name, chunk.text, emb_blob, now)
             )
-
-            # Insert into FTS index
-            try:
-                self._conn.execute(
-                    "INSERT INTO chunks_fts (id, path, start_line, end_line, text) VALUES (?, ?, ?, ?, ?)",
-                    (chunk_id, rel_path, chunk.start_line, chunk.end_line, chunk.text),
+            fts_rows.append((chunk_id, chunk.text))
+            if self._has_vec:
+                vec_rows.append(
+                    (chunk_id, quantize_int8(np.frombuffer(emb_blob, dtype=np.float32)))
                 )
-            except sqlite3.OperationalError:
-                pass
 
-            # Insert into vector index
+        if not chunk_rows:
+            return
+
+        self._conn.executemany(_INSERT_CHUNK_SQL, chunk_rows)
+
+        if self._has_fts:
+            self._conn.executemany(_INSERT_FTS_SQL, fts_rows)
+
+        if self._has_vec:
             try:
-                self._conn.execute(
-                    "INSERT INTO chunks_vec (id, embedding) VALUES (?, ?)",
-                    (chunk_id, emb_blob),
-                )
+                self._conn.executemany(_INSERT_VEC_SQL, vec_rows)
             except sqlite3.OperationalError:
-                pass
+                # A misconfigured embedding_dim makes vec0 reject the
+                # rows; degrade to keyword-only search rather than
+                # failing the whole sync.
+                self._has_vec = False
 
     def _remove_file(self, rel_path: str) -> None:
         """Remove a file and its chunks from the database."""
-        # Get chunk IDs before deleting
-        chunk_ids = [
-            row[0]
-            for row in self._conn.execute(
+        if self._has_fts:
+            self._conn.execute(
+                "DELETE FROM chunks_fts WHERE id IN (SELECT id FROM chunks WHERE path = ?)",
+                (rel_path,),
+            )
+
+        if self._has_vec:
+            # vec0 can't evaluate an IN (SELECT ...) subquery, so feed it
+            # the ids explicitly.
+            chunk_ids = self._conn.execute(
                 "SELECT id FROM chunks WHERE path = ?", (rel_path,)
             ).fetchall()
-        ]
-
-        # Delete from FTS
-        for cid in chunk_ids:
-            try:
-                self._conn.execute(
-                    "DELETE FROM chunks_fts WHERE id = ?", (cid,)
-                )
-            except sqlite3.OperationalError:
-                pass
-
-        # Delete from vector index
-        for cid in chunk_ids:
-            try:
-                self._conn.execute(
-                    "DELETE FROM chunks_vec WHERE id = ?", (cid,)
-                )
-            except sqlite3.OperationalError:
-                pass
+            self._conn.executemany(
+                "DELETE FROM chunks_vec WHERE id = ?",
+                [(row[0],) for row in chunk_ids],
+            )
 
         self._conn.execute("DELETE FROM chunks WHERE path = ?", (rel_path,))
         self._conn.execute("DELETE FROM files WHERE path = ?", (rel_path,))
 
 
+# Cached line-buffered append handles for daily log files, so frequent
+# session logging doesn't pay an open/close cycle per entry.
+_LOG_HANDLES: dict[Path, TextIO] = {}
+_LOG_LOCK = threading.Lock()
+
+
+def _get_log_handle(path: Path) -> TextIO:
+    """Return a cached append handle for a daily log file.
+
+    Only the current day's handle is kept: asking for a new path closes
+    any stale ones, and whatever remains is closed at interpreter exit.
+    """
+    with _LOG_LOCK:
+        handle = _LOG_HANDLES.get(path)
+        if handle is None or handle.closed:
+            for old_path in [p for p in _LOG_HANDLES if p != path]:
+                _LOG_HANDLES.pop(old_path).close()
+            handle = open(path, "a", encoding="utf-8", buffering=1)
+            _LOG_HANDLES[path] = handle
+        return handle
+
+
+def _close_log_handles() -> None:
+    with _LOG_LOCK:
+        for handle in _LOG_HANDLES.values():
+            handle.close()
+        _LOG_HANDLES.clear()
+
+
+atexit.register(_close_log_handles)
+
+
 def log_session(
     daily_dir: str | Path,
     timestamp: str,
@@ -285,7 +577,9 @@ def log_session(
 
     entry_parts.append("---\n")
 
-    with open(file_path, "a", encoding="utf-8") as f:
-        f.writelines(entry_parts)
+    # One write, not writelines: the cached handle is line-buffered, so
+    # writelines would flush per newline-terminated part while a single
+    # joined write flushes once per entry.
+    _get_log_handle(file_path).write("".join(entry_parts))
 
     return file_path
@@ -79,6 +79,25 @@ class TestMemoryManagerSync:
         assert stats["added"] == 0
         manager.close()
 
+    def test_sync_update_reuses_unchanged_chunk_embeddings(self, tmp_path: Path) -> None:
+        # Tiny chunks so each line becomes its own chunk
+        manager = _make_manager(tmp_path, chunk_tokens=25, chunk_overlap=0)
+        test_file = tmp_path / "memory" / "test.md"
+        old_lines = [f"line {i} " + "x" * 90 for i in range(4)]
+        test_file.write_text("\n".join(old_lines))
+        manager.sync()
+
+        new_lines = [f"line {i} " + "y" * 90 for i in range(4, 8)]
+        test_file.write_text("\n".join(old_lines + new_lines))
+        manager._embedder.embed_batch.reset_mock()
+        stats = manager.sync()
+        assert stats["updated"] == 1
+        # Only the appended chunks should have been embedded
+        embedded = manager._embedder.embed_batch.call_args[0][0]
+        assert len(embedded) == len(new_lines)
+        assert all("y" in text for text in embedded)
+        manager.close()
+
     def test_sync_multiple_files(self, tmp_path: Path) -> None:
         manager = _make_manager(tmp_path)
         (tmp_path / "memory" / "a.md").write_text("# A\n\nFile A.")
@@ -87,6 +106,22 @@ class TestMemoryManagerSync:
         assert stats["added"] == 2
         manager.close()
 
+    def test_sync_paths_targets_subset(self, tmp_path: Path) -> None:
+        manager = _make_manager(tmp_path)
+        mem_dir = tmp_path / "memory"
+        (mem_dir / "a.md").write_text("# A\n\nFile A.")
+        (mem_dir / "b.md").write_text("# B\n\nFile B.")
+        manager.sync()
+
+        (mem_dir / "a.md").write_text("# A\n\nChanged.")
+        (mem_dir / "b.md").unlink()
+        (mem_dir / "c.md").write_text("# C\n\nNew file.")
+        stats = manager._sync_paths(
+            {str(mem_dir / name) for name in ("a.md", "b.md", "c.md")}
+        )
+        assert stats == {"added": 1, "updated": 1, "deleted": 1, "unchanged": 0}
+        manager.close()
+
     def test_sync_subdirectory(self, tmp_path: Path) -> None:
         manager = _make_manager(tmp_path)
         daily_dir = tmp_path / "memory" / "daily"
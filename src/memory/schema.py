@@ -1,22 +1,96 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 from pathlib import Path
 
+# Per-thread read-only connections, keyed by database path. WAL allows
+# any number of readers alongside the single writer, but they only
+# parallelize when each thread has its own connection — concurrent
+# queries on one shared connection are serialized by SQLite.
+_READ_LOCAL = threading.local()
 
-def ensure_schema(db_path: str | Path) -> sqlite3.Connection:
+
+def get_read_conn(db_path: str | Path) -> sqlite3.Connection:
+    """Return this thread's read-only connection to the memory database.
+
+    The database must already exist (ensure_schema has run); the
+    connection is opened lazily per thread and reused for its lifetime.
+    """
+    key = str(db_path)
+    conns: dict[str, sqlite3.Connection] | None = getattr(
+        _READ_LOCAL, "conns", None
+    )
+    if conns is None:
+        conns = _READ_LOCAL.conns = {}
+    conn = conns.get(key)
+    if conn is None:
+        conn = sqlite3.connect(
+            f"file:{key}?mode=ro", uri=True, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("PRAGMA mmap_size=268435456")
+        try:
+            import sqlite_vec  # type: ignore[import-untyped]
+
+            sqlite_vec.load(conn)
+        except (ImportError, AttributeError, sqlite3.OperationalError):
+            pass
+        conns[key] = conn
+    return conn
+
+
+def get_cache_conn(db_path: str | Path) -> sqlite3.Connection:
+    """Open a cross-thread writer connection for the embedding cache.
+
+    The schema must already exist (ensure_schema has run). Opened with
+    check_same_thread=False so one EmbeddingProvider can serve tool
+    executors and scheduler threads as well as the main thread; callers
+    must serialize access themselves (sqlite3 objects are not otherwise
+    thread-safe).
+    """
+    conn = sqlite3.connect(
+        str(db_path), check_same_thread=False, cached_statements=256
+    )
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def ensure_schema(
+    db_path: str | Path, embedding_dim: int = 384
+) -> sqlite3.Connection:
     """Create/open the memory SQLite database and ensure all tables exist.
 
     Creates: files, chunks, chunks_fts (FTS5), embedding_cache tables.
-    Loads sqlite-vec extension and creates the vector virtual table.
+    Loads sqlite-vec extension and creates the vector virtual table,
+    sized to ``embedding_dim`` (rebuilt if an existing table disagrees,
+    e.g. after switching embedding models).
     Enables WAL mode for concurrent reads.
     """
     db_path = Path(db_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(str(db_path))
+    is_new = not db_path.exists() or db_path.stat().st_size == 0
+
+    # A larger statement cache keeps the hot search/insert statements
+    # compiled alongside the schema and maintenance SQL.
+    conn = sqlite3.connect(str(db_path), cached_statements=256)
     conn.row_factory = sqlite3.Row
+    if is_new:
+        # Must precede the first write (the WAL switch below counts):
+        # a 1536-byte embedding row straddles the default 4 KiB page,
+        # so 8 KiB pages halve the page reads per embedding scan.
+        conn.execute("PRAGMA page_size=8192")
     conn.execute("PRAGMA journal_mode=WAL")
+    # WAL makes NORMAL durable enough here; the rest trade a little memory
+    # for fewer syscalls on the sync/search paths.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA busy_timeout=30000")
 
     conn.execute("""
         CREATE TABLE IF NOT EXISTS files (
@@ -45,63 +119,110 @@ def ensure_schema(db_path: str | Path) -> sqlite3.Connection:
     conn.execute("""
         CREATE TABLE IF NOT EXISTS embedding_cache (
             hash TEXT NOT NULL,
+            normalized_hash TEXT,
             model TEXT NOT NULL,
             embedding BLOB NOT NULL,
             updated_at INTEGER NOT NULL,
             PRIMARY KEY (hash, model)
         )
     """)
+    # Databases created before the normalized_hash column gain it here;
+    # old rows keep NULL and simply never match a normalized probe.
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(embedding_cache)")}
+    if "normalized_hash" not in cols:
+        conn.execute("ALTER TABLE embedding_cache ADD COLUMN normalized_hash TEXT")
     conn.execute(
         "CREATE INDEX IF NOT EXISTS idx_embedding_cache_updated_at ON embedding_cache(updated_at)"
     )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_embedding_cache_normalized "
+        "ON embedding_cache(normalized_hash)"
+    )
 
     # FTS5 for keyword search
     _ensure_fts(conn)
 
     # sqlite-vec for vector search
-    _ensure_vec(conn)
+    _ensure_vec(conn, embedding_dim)
 
     conn.commit()
+    # Seed/refresh planner statistics so FTS and index scans are chosen
+    # from the start; cheap on an up-to-date database.
+    conn.execute("PRAGMA optimize")
     return conn
 
 
 def _ensure_fts(conn: sqlite3.Connection) -> None:
-    """Create FTS5 virtual table if not present."""
-    # Check if the table already exists
+    """Create FTS5 virtual table if not present.
+
+    The FTS index carries only the searchable text plus the id used to
+    join back to chunks; path and line metadata live in chunks alone,
+    roughly halving the FTS table.
+    """
+    # Rebuild the table if it predates the slim id+text layout
     row = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='chunks_fts'"
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='chunks_fts'"
     ).fetchone()
+    if row and "path" in row[0]:
+        conn.execute("DROP TABLE chunks_fts")
+        row = None
     if row:
         return
     try:
-        conn.execute("""
-            CREATE VIRTUAL TABLE chunks_fts USING fts5(
-                text,
-                id UNINDEXED,
-                path UNINDEXED,
-                start_line UNINDEXED,
-                end_line UNINDEXED
-            )
-        """)
+        conn.execute("CREATE VIRTUAL TABLE chunks_fts USING fts5(text, id UNINDEXED)")
+        conn.execute("INSERT INTO chunks_fts (id, text) SELECT id, text FROM chunks")
     except sqlite3.OperationalError:
         # FTS5 may not be available in all SQLite builds
         pass
 
 
-def _ensure_vec(conn: sqlite3.Connection) -> None:
-    """Load sqlite-vec extension and create vector table if available."""
+def _ensure_vec(conn: sqlite3.Connection, embedding_dim: int) -> None:
+    """Load sqlite-vec extension and create vector table if available.
+
+    The vec index stores int8-quantized vectors under cosine distance:
+    4x smaller rows than the float equivalent, so 4x more of the index
+    fits in the page cache, and the symmetric per-vector scale cancels
+    out of the cosine ranking. Full-precision float32 embeddings stay in
+    chunks.embedding for the numpy fallback and for reuse.
+    """
     try:
         import sqlite_vec  # type: ignore[import-untyped]
 
         sqlite_vec.load(conn)
-        # Check if vec table already exists
+        # Rebuild the table if it predates int8 quantization or was
+        # sized for a different embedding model.
         row = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='chunks_vec'"
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='chunks_vec'"
         ).fetchone()
+        if row and f"int8[{embedding_dim}]" not in row[0]:
+            conn.execute("DROP TABLE chunks_vec")
+            row = None
         if not row:
             conn.execute(
-                "CREATE VIRTUAL TABLE chunks_vec USING vec0(id TEXT PRIMARY KEY, embedding float[384])"
+                "CREATE VIRTUAL TABLE chunks_vec USING vec0("
+                f"id TEXT PRIMARY KEY, embedding int8[{embedding_dim}] "
+                "distance_metric=cosine)"
             )
+            _repopulate_vec(conn)
     except (ImportError, AttributeError, sqlite3.OperationalError):
         # sqlite-vec not installed, load_extension not available, or other issue
         pass
+
+
+def _repopulate_vec(conn: sqlite3.Connection) -> None:
+    """Refill chunks_vec from the float32 embeddings stored in chunks."""
+    import numpy as np
+
+    from src.memory.search import quantize_int8
+
+    rows = conn.execute(
+        "SELECT id, embedding FROM chunks WHERE embedding IS NOT NULL"
+    ).fetchall()
+    if rows:
+        conn.executemany(
+            "INSERT INTO chunks_vec (id, embedding) VALUES (?, ?)",
+            [
+                (r[0], quantize_int8(np.frombuffer(r[1], dtype=np.float32)))
+                for r in rows
+            ],
+        )
@@ -1,11 +1,62 @@
 from __future__ import annotations
 
+import functools
+import re
 import sqlite3
-import struct
 from dataclasses import dataclass
 
+import numpy as np
 
-@dataclass
+_FTS_TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
+
+
+# Snippets are truncated inside SQLite so full multi-KB chunk texts are
+# never marshaled across the C/Python boundary.
+_SNIPPET_CHARS = 700
+
+# Hot query text lives at module scope: sqlite3's per-connection
+# statement cache keys on the string object, so reusing the same
+# constants keeps both searches compiled across calls.
+_VEC_SQL = f"""
+    SELECT v.id, v.distance, c.path, c.start_line, c.end_line,
+           substr(c.text, 1, {_SNIPPET_CHARS})
+    FROM chunks_vec v
+    JOIN chunks c ON v.id = c.id
+    WHERE v.embedding MATCH ?
+    ORDER BY v.distance
+    LIMIT ?
+"""
+# ORDER BY f.rank is load-bearing: FTS5 recognizes the built-in rank
+# column and serves the LIMIT straight from a score-ordered index walk
+# (EXPLAIN QUERY PLAN: "SCAN f VIRTUAL TABLE INDEX 32:M2", no temp
+# B-tree). Spelling it bm25(chunks_fts) defeats the pushdown and adds
+# a "USE TEMP B-TREE FOR ORDER BY" step.
+_FTS_SQL = f"""
+    SELECT c.id, c.path, c.start_line, c.end_line,
+           substr(c.text, 1, {_SNIPPET_CHARS}), f.rank
+    FROM chunks_fts f
+    JOIN chunks c ON c.id = f.id
+    WHERE chunks_fts MATCH ?
+    ORDER BY f.rank
+    LIMIT ?
+"""
+
+
+def quantize_int8(vec: np.ndarray | list[float]) -> bytes:
+    """Quantize a float vector to symmetric per-vector int8 bytes.
+
+    chunks_vec stores int8[384] with cosine distance, so the per-vector
+    scale cancels out of the ranking and doesn't need to be stored.
+    """
+    v = np.asarray(vec, dtype=np.float32)
+    max_abs = float(np.max(np.abs(v))) if v.size else 0.0
+    if max_abs == 0.0:
+        return np.zeros(v.shape, dtype=np.int8).tobytes()
+    scaled = np.round(v * (127.0 / max_abs))
+    return np.clip(scaled, -127, 127).astype(np.int8).tobytes()
+
+
+@dataclass(slots=True)
 class SearchResult:
     id: str
     path: str
@@ -17,43 +68,84 @@ class SearchResult:
 
 def search_vector(
     conn: sqlite3.Connection,
-    query_embedding: list[float],
+    query_embedding: list[float] | np.ndarray,
     top_k: int = 5,
 ) -> list[SearchResult]:
     """Search chunks by vector cosine similarity using sqlite-vec."""
     try:
-        blob = struct.pack(f"{len(query_embedding)}f", *query_embedding)
-        rows = conn.execute(
-            """
-            SELECT v.id, v.distance, c.path, c.start_line, c.end_line, c.text
-            FROM chunks_vec v
-            JOIN chunks c ON v.id = c.id
-            WHERE v.embedding MATCH ?
-            ORDER BY v.distance
-            LIMIT ?
-            """,
-            (blob, top_k),
-        ).fetchall()
+        blob = quantize_int8(query_embedding)
+        rows = conn.execute(_VEC_SQL, (blob, top_k)).fetchall()
 
         results = []
         for row in rows:
-            # sqlite-vec returns distance (lower = more similar)
-            # Convert to a 0-1 score where higher = better
+            # Cosine distance lies in [0, 2]; map it linearly onto a
+            # 0-1 score where higher = better.
             distance = float(row[1])
-            score = 1.0 / (1.0 + distance)
+            score = 1.0 - distance / 2.0
             results.append(SearchResult(
                 id=row[0],
                 path=row[2],
                 start_line=row[3],
                 end_line=row[4],
-                snippet=row[5][:700] if row[5] else "",
+                snippet=row[5] or "",
                 score=score,
             ))
         return results
     except sqlite3.OperationalError:
-        # sqlite-vec not available
+        # sqlite-vec not available — brute-force scan the stored blobs
+        return _search_vector_numpy(conn, query_embedding, top_k)
+
+
+def _search_vector_numpy(
+    conn: sqlite3.Connection,
+    query_embedding: list[float] | np.ndarray,
+    top_k: int = 5,
+) -> list[SearchResult]:
+    """Vectorized cosine scan over chunks.embedding for builds without sqlite-vec.
+
+    Decodes all embeddings into one contiguous float32 matrix and scores
+    with a single BLAS matrix-vector product; top-k is selected with
+    argpartition instead of a full sort.
+    """
+    rows = conn.execute(
+        f"SELECT id, path, start_line, end_line, "
+        f"substr(text, 1, {_SNIPPET_CHARS}), embedding "
+        "FROM chunks WHERE embedding IS NOT NULL"
+    ).fetchall()
+    if not rows:
         return []
 
+    q = np.asarray(query_embedding, dtype=np.float32)
+    q_norm = float(np.linalg.norm(q))
+    if q_norm == 0.0:
+        return []
+    q /= q_norm
+
+    matrix = np.frombuffer(b"".join(row[5] for row in rows), dtype=np.float32)
+    matrix = matrix.reshape(len(rows), -1)
+    norms = np.linalg.norm(matrix, axis=1)
+    norms[norms == 0.0] = 1.0
+    sims = (matrix @ q) / norms
+
+    k = min(top_k, len(rows))
+    top = np.argpartition(sims, -k)[-k:]
+    top = top[np.argsort(sims[top])[::-1]]
+
+    results = []
+    for i in top:
+        row = rows[int(i)]
+        # Match the sqlite-vec scoring: cosine distance mapped to 0-1.
+        distance = max(0.0, 1.0 - float(sims[i]))
+        results.append(SearchResult(
+            id=row[0],
+            path=row[1],
+            start_line=row[2],
+            end_line=row[3],
+            snippet=row[4] or "",
+            score=1.0 - distance / 2.0,
+        ))
+    return results
+
 
 def search_keyword(
     conn: sqlite3.Connection,
@@ -66,16 +158,7 @@ def search_keyword(
         return []
 
     try:
-        rows = conn.execute(
-            """
-            SELECT f.id, f.path, f.start_line, f.end_line, f.text, rank
-            FROM chunks_fts f
-            WHERE chunks_fts MATCH ?
-            ORDER BY rank
-            LIMIT ?
-            """,
-            (fts_query, top_k),
-        ).fetchall()
+        rows = conn.execute(_FTS_SQL, (fts_query, top_k)).fetchall()
 
         results = []
         for row in rows:
@@ -87,7 +170,7 @@ def search_keyword(
                 path=row[1],
                 start_line=row[2],
                 end_line=row[3],
-                snippet=row[4][:700] if row[4] else "",
+                snippet=row[4] or "",
                 score=score,
             ))
         return results
@@ -99,7 +182,7 @@ def search_keyword(
 def search_hybrid(
     conn: sqlite3.Connection,
     query_text: str,
-    query_embedding: list[float],
+    query_embedding: list[float] | np.ndarray,
     top_k: int = 5,
     vector_weight: float = 0.7,
     text_weight: float = 0.3,
@@ -107,9 +190,22 @@ def search_hybrid(
     """Hybrid search combining vector similarity and BM25 keyword matching.
 
     Results are merged using weighted scoring and deduplicated by chunk ID.
+
+    Degraded inputs (no embedding, blank query) skip the corresponding
+    search entirely rather than paying a SQLite round-trip that can only
+    return nothing.
     """
-    vector_results = search_vector(conn, query_embedding, top_k=top_k * 2)
-    keyword_results = search_keyword(conn, query_text, top_k=top_k * 2)
+    has_embedding = query_embedding is not None and len(query_embedding) > 0
+    vector_results = (
+        search_vector(conn, query_embedding, top_k=top_k * 2)
+        if has_embedding
+        else []
+    )
+    keyword_results = (
+        search_keyword(conn, query_text, top_k=top_k * 2)
+        if query_text and query_text.strip()
+        else []
+    )
 
     return merge_hybrid_results(
         vector_results=vector_results,
@@ -127,61 +223,70 @@ def merge_hybrid_results(
     text_weight: float = 0.3,
     top_k: int = 5,
 ) -> list[SearchResult]:
-    """Merge vector and keyword results with weighted scoring."""
-    by_id: dict[str, dict] = {}
+    """Merge vector and keyword results with weighted scoring.
+
+    Candidates are accumulated into parallel arrays and the weighted
+    combination/top-k selection runs vectorized; SearchResult objects
+    are only built for the survivors.
+    """
+    idx: dict[str, int] = {}
+    candidates: list[SearchResult] = []
+    vector_scores: list[float] = []
+    text_scores: list[float] = []
 
     for r in vector_results:
-        by_id[r.id] = {
-            "id": r.id,
-            "path": r.path,
-            "start_line": r.start_line,
-            "end_line": r.end_line,
-            "snippet": r.snippet,
-            "vector_score": r.score,
-            "text_score": 0.0,
-        }
+        idx[r.id] = len(candidates)
+        candidates.append(r)
+        vector_scores.append(r.score)
+        text_scores.append(0.0)
 
     for r in keyword_results:
-        if r.id in by_id:
-            by_id[r.id]["text_score"] = r.score
+        i = idx.get(r.id)
+        if i is not None:
+            text_scores[i] = r.score
             if r.snippet:
-                by_id[r.id]["snippet"] = r.snippet
+                candidates[i] = r
         else:
-            by_id[r.id] = {
-                "id": r.id,
-                "path": r.path,
-                "start_line": r.start_line,
-                "end_line": r.end_line,
-                "snippet": r.snippet,
-                "vector_score": 0.0,
-                "text_score": r.score,
-            }
-
-    merged = []
-    for entry in by_id.values():
-        score = vector_weight * entry["vector_score"] + text_weight * entry["text_score"]
-        merged.append(SearchResult(
-            id=entry["id"],
-            path=entry["path"],
-            start_line=entry["start_line"],
-            end_line=entry["end_line"],
-            snippet=entry["snippet"],
-            score=score,
-        ))
+            idx[r.id] = len(candidates)
+            candidates.append(r)
+            vector_scores.append(0.0)
+            text_scores.append(r.score)
+
+    if not candidates:
+        return []
+
+    scores = (
+        vector_weight * np.asarray(vector_scores)
+        + text_weight * np.asarray(text_scores)
+    )
+    k = min(top_k, len(candidates))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
 
-    merged.sort(key=lambda r: r.score, reverse=True)
-    return merged[:top_k]
+    return [
+        SearchResult(
+            id=candidates[i].id,
+            path=candidates[i].path,
+            start_line=candidates[i].start_line,
+            end_line=candidates[i].end_line,
+            snippet=candidates[i].snippet,
+            score=float(scores[i]),
+        )
+        for i in top
+    ]
 
 
+@functools.lru_cache(maxsize=1024)
 def _build_fts_query(raw: str) -> str | None:
-    """Convert a natural language query to an FTS5 query string."""
-    import re
+    """Convert a natural language query to an FTS5 query string.
 
-    tokens = re.findall(r"[A-Za-z0-9_]+", raw)
+    Memoized: agent sessions re-ask identical queries (hybrid search,
+    heartbeat prompts), so repeats skip the tokenize-and-quote work.
+    """
+    tokens = _FTS_TOKEN_RE.findall(raw)
     if not tokens:
         return None
-    quoted = [f'"{t}"' for t in tokens]
-    return " AND ".join(quoted)
+    return " AND ".join(f'"{t}"' for t in tokens)
 
 
 def _bm25_rank_to_score(rank: float) -> float:
@@ -1,6 +1,29 @@
 from __future__ import annotations
 
-from src.memory.search import SearchResult, merge_hybrid_results, _build_fts_query, _bm25_rank_to_score
+import numpy as np
+
+from src.memory.search import (
+    SearchResult,
+    merge_hybrid_results,
+    quantize_int8,
+    _build_fts_query,
+    _bm25_rank_to_score,
+)
+
+
+class TestQuantizeInt8:
+    def test_one_byte_per_dimension(self) -> None:
+        vec = np.linspace(-1.0, 1.0, 384).astype(np.float32)
+        assert len(quantize_int8(vec)) == 384
+
+    def test_scale_invariant(self) -> None:
+        # Per-vector symmetric scaling means multiples quantize identically
+        vec = np.linspace(-1.0, 1.0, 384).astype(np.float32)
+        assert quantize_int8(vec * 5.0) == quantize_int8(vec)
+
+    def test_zero_vector(self) -> None:
+        blob = quantize_int8(np.zeros(384, dtype=np.float32))
+        assert blob == b"\x00" * 384
 
 
 class TestBuildFtsQuery:
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import OrderedDict
+
+
+class SemanticCache:
+    """In-memory LRU + TTL cache keyed by embedding similarity.
+
+    Stores (embedding, text) pairs; a lookup whose cosine similarity to a
+    stored embedding meets the threshold returns the stored text. Vectors
+    are L2-normalized on insert so lookup is a plain dot product. Entries
+    expire after ttl seconds and the least recently used entry is evicted
+    once maxsize is reached.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: float = 300.0,
+        threshold: float = 0.95,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._entries: OrderedDict[int, tuple[float, list[float], str]] = OrderedDict()
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> list[float] | None:
+        norm = math.sqrt(sum(v * v for v in embedding))
+        if norm == 0.0:
+            return None
+        return [v / norm for v in embedding]
+
+    def get(self, embedding: list[float]) -> str | None:
+        """Return the cached text most similar to embedding, or None."""
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+
+        now = time.monotonic()
+        best_key: int | None = None
+        best_score = self.threshold
+        for key, (expires_at, vector, _) in list(self._entries.items()):
+            if expires_at < now:
+                del self._entries[key]
+                continue
+            score = sum(a * b for a, b in zip(query, vector))
+            if score >= best_score:
+                best_key = key
+                best_score = score
+
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key][2]
+
+    def put(self, embedding: list[float], text: str) -> None:
+        """Store text under embedding, evicting the LRU entry if full."""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        self._entries[self._next_id] = (time.monotonic() + self.ttl, vector, text)
+        self._next_id += 1
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from src.memory.semantic_cache import SemanticCache
+
+
+def test_exact_match_hits() -> None:
+    cache = SemanticCache()
+    cache.put([1.0, 0.0], "answer")
+    assert cache.get([1.0, 0.0]) == "answer"
+
+
+def test_similar_vector_hits() -> None:
+    cache = SemanticCache(threshold=0.95)
+    cache.put([1.0, 0.0], "answer")
+    # cos([1,0], [1,0.1]) ~= 0.995
+    assert cache.get([1.0, 0.1]) == "answer"
+
+
+def test_dissimilar_vector_misses() -> None:
+    cache = SemanticCache(threshold=0.95)
+    cache.put([1.0, 0.0], "answer")
+    assert cache.get([0.0, 1.0]) is None
+
+
+def test_zero_vector_is_ignored() -> None:
+    cache = SemanticCache()
+    cache.put([0.0, 0.0], "answer")
+    assert len(cache) == 0
+    assert cache.get([0.0, 0.0]) is None
+
+
+def test_ttl_expiry() -> None:
+    cache = SemanticCache(ttl=-1.0)
+    cache.put([1.0, 0.0], "stale")
+    assert cache.get([1.0, 0.0]) is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction() -> None:
+    cache = SemanticCache(maxsize=2, threshold=0.99)
+    cache.put([1.0, 0.0, 0.0], "a")
+    cache.put([0.0, 1.0, 0.0], "b")
+    # Touch "a" so "b" becomes least recently used.
+    assert cache.get([1.0, 0.0, 0.0]) == "a"
+    cache.put([0.0, 0.0, 1.0], "c")
+    assert cache.get([0.0, 1.0, 0.0]) is None
+    assert cache.get([1.0, 0.0, 0.0]) == "a"
+    assert cache.get([0.0, 0.0, 1.0]) == "c"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import heapq
 import time
 import uuid
 from dataclasses import dataclass, field
@@ -10,7 +11,7 @@ from typing import Any
 from src.memory.manager import log_session
 
 
-@dataclass
+@dataclass(slots=True)
 class Session:
     """A conversation session with the agent."""
 
@@ -29,22 +30,34 @@ class SessionManager:
         daily_dir: str | Path = "memory/daily",
     ) -> None:
         self.timeout_minutes = timeout_minutes
+        self._timeout_seconds = timeout_minutes * 60
         self.daily_dir = Path(daily_dir)
         self._sessions: dict[str, Session] = {}
+        # Min-heap of (expiry, session id). Entries are pushed lazily on
+        # every activity bump; stale ones are treated as tombstones when
+        # popped, so cleanup is O(expired) instead of a full scan.
+        self._expiry_heap: list[tuple[float, str]] = []
 
     def create_session(self) -> Session:
         """Create a new session with a unique ID."""
         session = Session(id=str(uuid.uuid4()))
         self._sessions[session.id] = session
+        self._push_expiry(session)
         return session
 
+    def _push_expiry(self, session: Session) -> None:
+        heapq.heappush(
+            self._expiry_heap,
+            (session.last_active + self._timeout_seconds, session.id),
+        )
+
     def get_session(self, session_id: str) -> Session | None:
         """Get an active session by ID, or None if expired/missing."""
         session = self._sessions.get(session_id)
         if session is None:
             return None
         if self._is_expired(session):
-            self._expire_session(session_id)
+            self._sessions.pop(session_id, None)
             return None
         return session
 
@@ -61,6 +74,7 @@ class SessionManager:
         session = self._sessions.get(session_id)
         if session:
             session.last_active = time.time()
+            self._push_expiry(session)
 
     def add_exchange(
         self,
@@ -76,6 +90,7 @@ class SessionManager:
         if messages is not None:
             session.messages = messages
         session.last_active = time.time()
+        self._push_expiry(session)
 
     def log_and_close(
         self,
@@ -102,28 +117,33 @@ class SessionManager:
 
     def cleanup_expired(self) -> int:
         """Remove expired sessions. Returns the number of sessions cleaned up."""
-        expired = [
-            sid for sid, session in self._sessions.items()
-            if self._is_expired(session)
-        ]
-        for sid in expired:
-            self._expire_session(sid)
-        return len(expired)
+        now = time.time()
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, sid = heapq.heappop(heap)
+            session = self._sessions.get(sid)
+            if session is None:
+                continue  # tombstone: closed or already expired
+            if self._is_expired(session, now):
+                del self._sessions[sid]
+                removed += 1
+            # Otherwise the session was touched since this entry was
+            # pushed; the fresher heap entry covers it.
+        return removed
 
     @property
     def active_sessions(self) -> list[str]:
         """List IDs of all active (non-expired) sessions."""
-        return [
-            sid for sid, session in self._sessions.items()
-            if not self._is_expired(session)
-        ]
-
-    def _is_expired(self, session: Session) -> bool:
-        """Check if a session has exceeded the idle timeout."""
-        elapsed = time.time() - session.last_active
-        return elapsed > self.timeout_minutes * 60
-
-    def _expire_session(self, session_id: str) -> None:
-        """Remove an expired session."""
-        if session_id in self._sessions:
-            del self._sessions[session_id]
+        self.cleanup_expired()
+        return list(self._sessions)
+
+    def _is_expired(self, session: Session, now: float | None = None) -> bool:
+        """Check if a session has exceeded the idle timeout.
+
+        ``now`` lets batch callers snapshot the clock once instead of a
+        time.time() call per session.
+        """
+        if now is None:
+            now = time.time()
+        return now - session.last_active > self._timeout_seconds
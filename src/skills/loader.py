@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import functools
 import os
 import re
 import shutil
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Callable
 
 import yaml
 
+try:
+    # libyaml parses frontmatter an order of magnitude faster than the
+    # pure-Python loader; fall back when PyYAML was built without it.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
 from src.skills.types import Skill
 
+_FRONTMATTER_RE = re.compile(r"^---\s*\n(.*?)\n---\s*\n?(.*)", re.DOTALL)
+
 
 def _parse_frontmatter(text: str) -> tuple[dict[str, Any], str]:
     """Parse YAML frontmatter from a Markdown file.
@@ -18,98 +29,367 @@ def _parse_frontmatter(text: str) -> tuple[dict[str, Any], str]:
     Returns (metadata_dict, body_text). If no frontmatter is found,
     returns an empty dict and the full text.
     """
-    match = re.match(r"^---\s*\n(.*?)\n---\s*\n?(.*)", text, re.DOTALL)
-    if not match:
+    # Cheap prefix test so files without frontmatter skip everything
+    if not text.startswith("---"):
         return {}, text
 
-    try:
-        metadata = yaml.safe_load(match.group(1))
-        if not isinstance(metadata, dict):
+    # Fast path for the canonical fencing ("---\n" ... "\n---"): two
+    # find/slice operations instead of a backtracking DOTALL regex.
+    # Unusual fences (trailing spaces, "---" run-ons) fall back to the
+    # regex, which defines the semantics.
+    if text.startswith("---\n"):
+        end = text.find("\n---", 4)
+        if end == -1:
+            return {}, text
+        block = text[4:end]
+        body = text[end + 4:].lstrip()
+    else:
+        match = _FRONTMATTER_RE.match(text)
+        if not match:
             return {}, text
-    except yaml.YAMLError:
+        block, body = match.group(1), match.group(2)
+
+    metadata = _parse_block_fast(block)
+    if metadata is None:
+        try:
+            metadata = yaml.load(block, Loader=_YamlLoader)
+        except yaml.YAMLError:
+            return {}, text
+    if not isinstance(metadata, dict):
         return {}, text
 
-    return metadata, match.group(2)
+    return metadata, body
+
+
+# Plain string scalars only: anything that YAML would type-convert,
+# quote-process beyond simple stripping, or treat as structure makes
+# the fast parser bail.
+_SCALAR_BAIL = ("{", "}", "[", "]", "&", "*", "|", ">", "%", "@", "`", "!")
+_YAML_WORDS = frozenset(
+    ("true", "false", "null", "yes", "no", "on", "off", "~")
+)
+
+
+def _parse_scalar_fast(s: str) -> str | None:
+    s = s.strip()
+    if not s:
+        return None
+    if s[0] in "\"'":
+        if len(s) >= 2 and s[-1] == s[0] and s[0] not in s[1:-1]:
+            return s[1:-1]
+        return None
+    if s[0] in _SCALAR_BAIL or ": " in s or " #" in s or "\t" in s:
+        return None
+    if s.lower() in _YAML_WORDS:
+        return None
+    try:
+        float(s)
+    except ValueError:
+        return s
+    return None
+
 
+def _parse_block_fast(block: str) -> dict[str, Any] | None:
+    """Parse the fixed skill frontmatter schema without a YAML parser.
 
-def _check_bins(bins: list[str]) -> bool:
+    Handles what real SKILL.md files contain: string-valued top-level
+    keys plus nested mappings and string lists (inline ``[a, b]`` or
+    indented ``- item``), covering metadata.requires.{bins,env}.
+    Returns None on any construct outside that shape so the caller
+    falls back to the YAML loader, which defines the semantics.
+    """
+    lines: list[tuple[int, str]] = []
+    for raw in block.splitlines():
+        stripped = raw.lstrip(" ")
+        if not stripped or stripped.startswith("#"):
+            continue
+        if "\t" in raw:
+            return None
+        lines.append((len(raw) - len(stripped), stripped.rstrip()))
+    if not lines:
+        return None
+    out, nxt = _parse_mapping_fast(lines, 0, lines[0][0])
+    if out is None or nxt != len(lines):
+        return None
+    return out
+
+
+def _parse_mapping_fast(
+    lines: list[tuple[int, str]], i: int, indent: int
+) -> tuple[dict[str, Any] | None, int]:
+    out: dict[str, Any] = {}
+    while i < len(lines):
+        ind, s = lines[i]
+        if ind < indent:
+            break
+        if ind > indent or s.startswith("- "):
+            return None, i
+        key, sep, rest = s.partition(":")
+        if not sep or not key or key != key.strip():
+            return None, i
+        if any(c in key for c in "\"'{}[],#&* "):
+            return None, i
+        rest = rest.strip()
+        i += 1
+        val: Any
+        if not rest:
+            if i >= len(lines) or lines[i][0] <= indent:
+                return None, i  # "key:" with no children: YAML null
+            child_ind, child_s = lines[i]
+            if child_s.startswith("- "):
+                val, i = _parse_list_fast(lines, i, child_ind)
+            else:
+                val, i = _parse_mapping_fast(lines, i, child_ind)
+            if val is None:
+                return None, i
+        elif rest.startswith("[") and rest.endswith("]"):
+            inner = rest[1:-1].strip()
+            if not inner:
+                val = []
+            else:
+                items = [_parse_scalar_fast(p) for p in inner.split(",")]
+                if any(item is None for item in items):
+                    return None, i
+                val = items
+        else:
+            val = _parse_scalar_fast(rest)
+            if val is None:
+                return None, i
+        out[key] = val
+    return out, i
+
+
+def _parse_list_fast(
+    lines: list[tuple[int, str]], i: int, indent: int
+) -> tuple[list[str] | None, int]:
+    out: list[str] = []
+    while i < len(lines):
+        ind, s = lines[i]
+        if ind < indent:
+            break
+        if ind > indent or not s.startswith("- "):
+            return None, i
+        item = _parse_scalar_fast(s[2:])
+        if item is None:
+            return None, i
+        out.append(item)
+        i += 1
+    return out, i
+
+
+def _build_path_index() -> set[str]:
+    """Collect the names of executables on PATH in one pass.
+
+    shutil.which walks every PATH entry per binary; with many skills
+    that multiplies out to N*M directory traversals. One scandir pass
+    per PATH entry turns each later check into a set lookup.
+    """
+    index: set[str] = set()
+    for p in os.environ.get("PATH", "").split(os.pathsep):
+        if not p:
+            continue
+        try:
+            entries = os.scandir(p)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and os.access(entry.path, os.X_OK):
+                        index.add(entry.name)
+                except OSError:
+                    continue
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def _which_cached(binary: str) -> bool:
+    """Memoized shutil.which for path-qualified binaries.
+
+    Plain names resolve through the PATH index; this only backs the
+    os.sep fallback, so repeated references to the same absolute path
+    across skills stat it once.
+    """
+    return shutil.which(binary) is not None
+
+
+def _check_bins(bins: tuple[str, ...], path_index: set[str]) -> bool:
     """Check if all required binaries are on PATH."""
-    return all(shutil.which(b) is not None for b in bins)
+    return all(
+        b in path_index or (os.sep in b and _which_cached(b))
+        for b in bins
+    )
 
 
-def _check_env(env_vars: list[str]) -> bool:
+def _check_env(env_vars: tuple[str, ...]) -> bool:
     """Check if all required environment variables are set."""
     return all(os.environ.get(v) for v in env_vars)
 
 
+# directory -> (mtime signature, skills). Re-listing and re-parsing
+# every SKILL.md (plus shutil.which walking PATH per binary) is wasted
+# work when nothing under the directory has changed.
+_DISCOVER_CACHE: dict[Path, tuple[tuple[tuple[str, int], ...], list[Skill]]] = {}
+
+
+def clear_discover_cache() -> None:
+    """Drop cached discovery results (for tests that mutate PATH/env)."""
+    _DISCOVER_CACHE.clear()
+
+
+def _mtime_signature(skills_dir: Path) -> tuple[tuple[str, int], ...]:
+    """Stat-only fingerprint of the directory and each SKILL.md.
+
+    Uses st_mtime_ns: the float st_mtime loses sub-microsecond
+    precision, enough for two quick saves to collide on coarse
+    filesystems.
+    """
+    sig: list[tuple[str, int]] = [("", skills_dir.stat().st_mtime_ns)]
+    with os.scandir(skills_dir) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        try:
+            mtime = os.stat(os.path.join(entry.path, "SKILL.md")).st_mtime_ns
+        except OSError:
+            continue
+        sig.append((entry.name, mtime))
+    return tuple(sig)
+
+
+def _load_skill_file(
+    entry: os.DirEntry[str],
+) -> tuple[str, str, dict[str, Any], str] | None:
+    """Read and parse one directory's SKILL.md.
+
+    Returns (dir name, file path, metadata, body), or None when the
+    file is missing or unreadable. Raw fd read: skips TextIOWrapper
+    setup and decodes the small file in one shot.
+    """
+    skill_file = os.path.join(entry.path, "SKILL.md")
+    try:
+        fd = os.open(skill_file, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size) if size else b""
+    finally:
+        os.close(fd)
+    metadata, body = _parse_frontmatter(data.decode("utf-8"))
+    return (entry.name, skill_file, metadata, body)
+
+
 def discover_skills(skills_dir: str | Path) -> list[Skill]:
     """Scan the skills directory for SKILL.md files and load them.
 
     Each subdirectory containing a SKILL.md file is treated as a skill.
     Returns a list of Skill objects with the `available` flag set based
     on whether required binaries and env vars are present.
+
+    Results are cached against the SKILL.md mtimes, so repeated calls
+    (watcher events, prompt rebuilds) cost a handful of stats unless a
+    skill actually changed. Note that PATH or env changes alone don't
+    invalidate the cache.
     """
     skills_dir = Path(skills_dir)
     if not skills_dir.exists():
         return []
 
+    signature = _mtime_signature(skills_dir)
+    cached = _DISCOVER_CACHE.get(skills_dir)
+    if cached is not None and cached[0] == signature:
+        return list(cached[1])
+
     skills: list[Skill] = []
-    for entry in sorted(skills_dir.iterdir()):
-        if not entry.is_dir():
-            continue
-        skill_file = entry / "SKILL.md"
-        if not skill_file.exists():
-            continue
+    path_index: set[str] | None = None  # built once, on first skill with bins
+    # scandir hands back directory-ness from the readdir d_type, and
+    # opening SKILL.md directly (EAFP) replaces the exists-then-read
+    # double stat of the pathlib version.
+    with os.scandir(skills_dir) as it:
+        entries = sorted(
+            (e for e in it if e.is_dir()), key=lambda e: e.name
+        )
 
-        text = skill_file.read_text(encoding="utf-8")
-        metadata, body = _parse_frontmatter(text)
+    # Reads release the GIL, so cold-cache directories (network FS, many
+    # skills) parse in parallel; the pool isn't worth spinning up for a
+    # couple of entries. Availability checks stay on this thread.
+    if len(entries) <= 2:
+        parsed = [_load_skill_file(e) for e in entries]
+    else:
+        with ThreadPoolExecutor(max_workers=min(8, len(entries))) as pool:
+            parsed = list(pool.map(_load_skill_file, entries))
+
+    for item in parsed:
+        if item is None:
+            continue
+        dir_name, skill_file, metadata, body = item
 
-        name = metadata.get("name", entry.name)
+        name = metadata.get("name", dir_name)
         description = metadata.get("description", "")
         requires = metadata.get("metadata", {}).get("requires", {})
         requires_bins = requires.get("bins", [])
         requires_env = requires.get("env", [])
 
-        if not isinstance(requires_bins, list):
-            requires_bins = []
-        if not isinstance(requires_env, list):
-            requires_env = []
+        requires_bins = (
+            tuple(requires_bins) if isinstance(requires_bins, list) else ()
+        )
+        requires_env = (
+            tuple(requires_env) if isinstance(requires_env, list) else ()
+        )
 
-        available = _check_bins(requires_bins) and _check_env(requires_env)
+        if requires_bins and path_index is None:
+            path_index = _build_path_index()
+        available = (
+            _check_bins(requires_bins, path_index or set())
+            and _check_env(requires_env)
+        )
 
         skills.append(
             Skill(
                 name=name,
                 description=description,
                 content=body.strip(),
-                path=str(skill_file),
+                path=skill_file,
                 requires_bins=requires_bins,
                 requires_env=requires_env,
                 available=available,
             )
         )
 
-    return skills
+    _DISCOVER_CACHE[skills_dir] = (signature, skills)
+    return list(skills)
 
 
 def format_skills_list(skills: list[Skill]) -> str:
     """Format available skills as a Markdown list for the system prompt."""
-    available = [s for s in skills if s.available]
-    if not available:
+    lines = [f"- **{s.name}**: {s.description}" for s in skills if s.available]
+    if not lines:
         return ""
+    return "## Available Skills\n\n" + "\n".join(lines)
+
+
+def index_skills(skills: list[Skill]) -> dict[str, Skill]:
+    """Build a name -> Skill map; first occurrence wins on duplicates."""
+    index: dict[str, Skill] = {}
+    for s in skills:
+        index.setdefault(s.name, s)
+    return index
 
-    lines = ["## Available Skills\n"]
-    for s in available:
-        lines.append(f"- **{s.name}**: {s.description}")
-    return "\n".join(lines)
+
+@functools.lru_cache(maxsize=32)
+def _cached_index(skills: tuple[Skill, ...]) -> dict[str, Skill]:
+    return index_skills(list(skills))
 
 
 def get_skill_content(skills: list[Skill], skill_name: str) -> str | None:
-    """Return the full Markdown body of a skill by name."""
-    for s in skills:
-        if s.name == skill_name:
-            return s.content
-    return None
+    """Return the full Markdown body of a skill by name.
+
+    Skill is frozen/hashable, so the name index is memoized on the
+    skill tuple: repeated lookups against the same discovery result are
+    a dict probe instead of an O(N) scan.
+    """
+    skill = _cached_index(tuple(skills)).get(skill_name)
+    return skill.content if skill is not None else None
 
 
 class SkillWatcher:
@@ -125,9 +405,17 @@ class SkillWatcher:
         self.on_update = on_update
         self.debounce_seconds = debounce_seconds
         self._observer: Any = None
+        self._handler: Any = None
 
     def start(self) -> None:
-        """Start watching for skill file changes."""
+        """Start watching for skill file changes.
+
+        A no-op when the skills directory doesn't exist, matching
+        discover_skills — a fresh install without a skills dir should
+        run without one, not crash in observer.schedule.
+        """
+        if not self.skills_dir.exists():
+            return
         try:
             from watchdog.observers import Observer
             from watchdog.events import FileSystemEventHandler
@@ -137,28 +425,52 @@ class SkillWatcher:
         watcher = self
 
         class _Handler(FileSystemEventHandler):
+            """Trailing debounce: each event re-arms a timer, so a burst
+            of saves triggers exactly one rediscovery after the burst
+            settles instead of one per leading event."""
+
             def __init__(self) -> None:
-                self._last_sync = 0.0
+                self._lock = threading.Lock()
+                self._timer: threading.Timer | None = None
 
             def on_any_event(self, event: Any) -> None:
                 if not event.src_path.endswith(".md"):
                     return
-                now = time.time()
-                if now - self._last_sync < watcher.debounce_seconds:
-                    return
-                self._last_sync = now
+                with self._lock:
+                    if self._timer is not None:
+                        self._timer.cancel()
+                    self._timer = threading.Timer(
+                        watcher.debounce_seconds, self._flush
+                    )
+                    self._timer.daemon = True
+                    self._timer.start()
+
+            def _flush(self) -> None:
+                with self._lock:
+                    self._timer = None
                 skills = discover_skills(watcher.skills_dir)
                 if watcher.on_update:
                     watcher.on_update(skills)
 
+            def cancel(self) -> None:
+                with self._lock:
+                    if self._timer is not None:
+                        self._timer.cancel()
+                        self._timer = None
+
+        handler = _Handler()
         observer = Observer()
-        observer.schedule(_Handler(), str(self.skills_dir), recursive=True)
+        observer.schedule(handler, str(self.skills_dir), recursive=True)
         observer.daemon = True
         observer.start()
         self._observer = observer
+        self._handler = handler
 
     def stop(self) -> None:
         """Stop the file watcher."""
+        if self._handler is not None:
+            self._handler.cancel()
+            self._handler = None
         if self._observer is not None:
             self._observer.stop()
             self._observer = None
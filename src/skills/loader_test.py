@@ -6,6 +6,7 @@ from pathlib import Path
 import pytest
 
 from src.skills.loader import (
+    SkillWatcher,
     discover_skills,
     format_skills_list,
     get_skill_content,
@@ -93,7 +94,7 @@ def test_discover_no_bins_required(tmp_path: Path) -> None:
     assert len(skills) == 1
     assert skills[0].name == "notes"
     assert skills[0].available is True
-    assert skills[0].requires_bins == []
+    assert skills[0].requires_bins == ()
 
 
 def test_discover_missing_env(tmp_path: Path) -> None:
@@ -122,6 +123,14 @@ def test_discover_nonexistent_directory(tmp_path: Path) -> None:
     assert skills == []
 
 
+def test_watcher_start_nonexistent_directory(tmp_path: Path) -> None:
+    # Missing skills dir is a no-op, matching discover_skills
+    watcher = SkillWatcher(tmp_path / "nonexistent")
+    watcher.start()
+    assert watcher._observer is None
+    watcher.stop()
+
+
 def test_discover_dir_without_skill_md(tmp_path: Path) -> None:
     (tmp_path / "empty_dir").mkdir()
     skills = discover_skills(tmp_path)
@@ -201,3 +210,12 @@ def test_parse_frontmatter_none() -> None:
     meta, body = _parse_frontmatter("Just plain text")
     assert meta == {}
     assert body == "Just plain text"
+
+
+def test_parse_frontmatter_exotic_yaml_falls_back() -> None:
+    # Typed values are outside the fast parser's schema and must still
+    # come back correctly via the YAML fallback.
+    text = "---\nname: weather\nenabled: true\ncount: 3\n---\nBody"
+    meta, body = _parse_frontmatter(text)
+    assert meta == {"name": "weather", "enabled": True, "count": 3}
+    assert body == "Body"
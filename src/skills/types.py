@@ -1,16 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Skill:
-    """Represents a single skill loaded from a SKILL.md file."""
+    """Represents a single skill loaded from a SKILL.md file.
+
+    Immutable and slotted: instances are built once at discovery, then
+    shared (and cached) freely. Tuple requirements avoid allocating two
+    empty lists per skill in the common no-requirements case.
+    """
 
     name: str
     description: str
     content: str
     path: str
-    requires_bins: list[str] = field(default_factory=list)
-    requires_env: list[str] = field(default_factory=list)
+    requires_bins: tuple[str, ...] = ()
+    requires_env: tuple[str, ...] = ()
     available: bool = True
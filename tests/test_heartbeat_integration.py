@@ -4,38 +4,69 @@ Mocks Gmail/Calendar responses -> runs scheduler job -> verifies reasoning + not
 """
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from typing import TYPE_CHECKING, Any
+from unittest.mock import create_autospec, patch
 
 import pytest
 
-from src.config import Config
-from src.heartbeat.notifier import Notifier
-from src.heartbeat.scheduler import HeartbeatScheduler
+# Application imports are deferred into fixtures/tests: pytest imports
+# every test module during collection, so keeping the top level free of
+# them lets -k selections elsewhere skip this module's transitive
+# imports entirely.
+if TYPE_CHECKING:
+    from src.config import Config
 
+_MEMORY_FILES = {
+    "SOUL.md": "I am a helpful assistant.",
+    "USER.md": "User is a busy engineer.",
+}
 
-@pytest.fixture
-def memory_manager(tmp_path: Path):
-    mm = MagicMock()
-    mm.get_file_content.side_effect = lambda name: {
-        "SOUL.md": "I am a helpful assistant.",
-        "USER.md": "User is a busy engineer.",
-    }.get(name)
-    return mm
 
+class _FakeMemory:
+    """Plain stand-in for MemoryManager: no tests assert on its calls,
+    so mock dispatch/recording overhead buys nothing here."""
+
+    memory_dir = Path("memory")  # nonexistent; scheduler treats as unstatable
+
+    def get_file_content(self, name: str) -> str | None:
+        return _MEMORY_FILES.get(name)
+
+
+@dataclass
+class _HBEnv:
+    config: "Config"
+    memory: _FakeMemory
+    notifier: Any
 
-@pytest.fixture
-def notifier():
-    return MagicMock(spec=Notifier)
+
+# Spec'd mocks introspect the target class on construction; building
+# the notifier once per module and resetting between tests keeps
+# isolation while paying that cost a single time. One bundled fixture
+# also means one fixture resolution per test instead of three.
+
+
+@pytest.fixture(scope="module")
+def _notifier_mock():
+    from src.heartbeat.notifier import Notifier
+
+    return create_autospec(Notifier, instance=True)
 
 
 @pytest.fixture
-def config():
-    return Config()
+def env(_notifier_mock):
+    from src.config import Config
+
+    _notifier_mock.reset_mock(return_value=True, side_effect=True)
+    return _HBEnv(Config(), _FakeMemory(), _notifier_mock)
 
 
-def test_gmail_check_triggers_notification(config, memory_manager, notifier):
+def test_gmail_check_triggers_notification(env):
     """When emails are found and Claude says to notify, notification is sent."""
+    from src.heartbeat.scheduler import HeartbeatScheduler
+
+    config, memory_manager, notifier = env.config, env.memory, env.notifier
     emails = [
         {
             "sender": "boss@company.com",
@@ -64,8 +95,11 @@ def test_gmail_check_triggers_notification(config, memory_manager, notifier):
     assert "server" in call_args[0][1].lower()
 
 
-def test_gmail_check_no_notification(config, memory_manager, notifier):
+def test_gmail_check_no_notification(env):
     """When Claude says no notification needed, nothing is sent."""
+    from src.heartbeat.scheduler import HeartbeatScheduler
+
+    config, memory_manager, notifier = env.config, env.memory, env.notifier
     emails = [
         {
             "sender": "newsletter@example.com",
@@ -91,8 +125,12 @@ def test_gmail_check_no_notification(config, memory_manager, notifier):
     notifier.notify.assert_not_called()
 
 
-def test_gmail_check_no_emails(config, memory_manager, notifier):
+def test_gmail_check_no_emails(env):
     """When there are no emails, no reasoning or notification happens."""
+    from src.heartbeat.scheduler import HeartbeatScheduler
+
+    config, memory_manager, notifier = env.config, env.memory, env.notifier
+
     def reason_fn(context: str, prompt: str) -> str:
         raise AssertionError("Should not be called")
 
@@ -109,8 +147,11 @@ def test_gmail_check_no_emails(config, memory_manager, notifier):
     notifier.notify.assert_not_called()
 
 
-def test_calendar_check_triggers_notification(config, memory_manager, notifier):
+def test_calendar_check_triggers_notification(env):
     """When events are found and Claude says to notify, notification is sent."""
+    from src.heartbeat.scheduler import HeartbeatScheduler
+
+    config, memory_manager, notifier = env.config, env.memory, env.notifier
     events = [
         {
             "title": "Team standup",
@@ -138,8 +179,11 @@ def test_calendar_check_triggers_notification(config, memory_manager, notifier):
     assert notifier.notify.call_args[0][0] == "calendar_reminder"
 
 
-def test_daily_summary_sends_notification(config, memory_manager, notifier):
+def test_daily_summary_sends_notification(env):
     """Daily summary gathers data and sends a summary notification."""
+    from src.heartbeat.scheduler import HeartbeatScheduler
+
+    config, memory_manager, notifier = env.config, env.memory, env.notifier
     events = [
         {
             "title": "Sprint review",
@@ -174,3 +218,20 @@ def test_daily_summary_sends_notification(config, memory_manager, notifier):
 
     notifier.notify.assert_called_once()
     assert notifier.notify.call_args[0][0] == "daily_summary"
+
+
+def test_mini_scheduler_runs_interval_job():
+    """Interval jobs fire repeatedly until shutdown."""
+    import time
+
+    from src.heartbeat.scheduler import _MiniScheduler
+
+    runs = []
+    sched = _MiniScheduler()
+    sched.add_interval_job(lambda: runs.append(time.time()), minutes=0.0005)
+    sched.start()
+    deadline = time.monotonic() + 2.0
+    while len(runs) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    sched.shutdown(wait=True)
+    assert len(runs) >= 2
@@ -4,6 +4,7 @@ Creates temp Markdown files -> syncs -> searches -> verifies results.
 """
 from __future__ import annotations
 
+import shutil
 from pathlib import Path
 
 import pytest
@@ -16,15 +17,12 @@ except ImportError:
 
 pytestmark = pytest.mark.skipif(not HAS_FASTEMBED, reason="fastembed not installed")
 
-from src.memory.manager import MemoryManager
+# MemoryManager is imported inside fixtures/tests so collection (and -k
+# runs that deselect this module) skip its transitive imports.
 
 
-@pytest.fixture
-def memory_env(tmp_path: Path):
-    """Set up a temporary memory directory with sample files."""
-    memory_dir = tmp_path / "memory"
-    memory_dir.mkdir()
-
+def _write_memory_files(memory_dir: Path) -> None:
+    """Create the sample memory files used by every test."""
     (memory_dir / "SOUL.md").write_text(
         "# Soul\n\nI am a helpful, patient assistant who values clarity."
     )
@@ -36,14 +34,66 @@ def memory_env(tmp_path: Path):
         "## 2025-01-20\nAlice mentioned she dislikes verbose error messages."
     )
 
+
+@pytest.fixture(scope="session")
+def _memory_template(tmp_path_factory: pytest.TempPathFactory):
+    """Sample memory dir synced into a database exactly once.
+
+    Embedding the sample files dominates this suite's runtime; the
+    per-test fixture copies this template so each test starts from an
+    already-indexed state instead of re-running model inference.
+    """
+    root = tmp_path_factory.mktemp("memory_template")
+    memory_dir = root / "memory"
+    memory_dir.mkdir()
+    _write_memory_files(memory_dir)
+
+    db_path = root / "data" / "memory.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    from src.memory.manager import MemoryManager
+
+    mm = MemoryManager(memory_dir=memory_dir, db_path=db_path)
+    mm.sync()
+    mm.close()
+    return memory_dir, db_path
+
+
+@pytest.fixture
+def memory_env(tmp_path: Path, _memory_template):
+    """Per-test copy of the pre-synced template.
+
+    File mtimes survive the copy, so the sync() each test runs sees
+    everything unchanged and skips straight past embedding.
+    """
+    template_dir, template_db = _memory_template
+    memory_dir = tmp_path / "memory"
+    shutil.copytree(template_dir, memory_dir)
+
     db_path = tmp_path / "data" / "memory.db"
     db_path.parent.mkdir(parents=True, exist_ok=True)
+    for db_file in template_db.parent.glob("memory.db*"):
+        shutil.copy2(db_file, db_path.parent / db_file.name)
 
     return memory_dir, db_path
 
 
-def test_sync_indexes_all_files(memory_env):
-    memory_dir, db_path = memory_env
+@pytest.fixture
+def fresh_memory_env(tmp_path: Path):
+    """Unsynced memory dir for the test asserting first-sync stats."""
+    memory_dir = tmp_path / "memory"
+    memory_dir.mkdir()
+    _write_memory_files(memory_dir)
+
+    db_path = tmp_path / "data" / "memory.db"
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    return memory_dir, db_path
+
+
+def test_sync_indexes_all_files(fresh_memory_env):
+    memory_dir, db_path = fresh_memory_env
+    from src.memory.manager import MemoryManager
+
     mm = MemoryManager(memory_dir=memory_dir, db_path=db_path)
     stats = mm.sync()
 
@@ -55,6 +105,8 @@ def test_sync_indexes_all_files(memory_env):
 
 def test_search_finds_relevant_content(memory_env):
     memory_dir, db_path = memory_env
+    from src.memory.manager import MemoryManager
+
     mm = MemoryManager(memory_dir=memory_dir, db_path=db_path)
     mm.sync()
 
@@ -67,6 +119,8 @@ def test_search_finds_relevant_content(memory_env):
 
 def test_search_finds_user_preferences(memory_env):
     memory_dir, db_path = memory_env
+    from src.memory.manager import MemoryManager
+
     mm = MemoryManager(memory_dir=memory_dir, db_path=db_path)
     mm.sync()
 
@@ -80,6 +134,8 @@ def test_search_finds_user_preferences(memory_env):
 
 def test_get_context_returns_formatted(memory_env):
     memory_dir, db_path = memory_env
+    from src.memory.manager import MemoryManager
+
     mm = MemoryManager(memory_dir=memory_dir, db_path=db_path)
     mm.sync()
 
@@ -91,6 +147,8 @@ def test_get_context_returns_formatted(memory_env):
 
 def test_update_file_reindexes(memory_env):
     memory_dir, db_path = memory_env
+    from src.memory.manager import MemoryManager
+
     mm = MemoryManager(memory_dir=memory_dir, db_path=db_path)
     mm.sync()
 
@@ -110,6 +168,8 @@ def test_update_file_reindexes(memory_env):
 
 def test_delete_file_removes_from_index(memory_env):
     memory_dir, db_path = memory_env
+    from src.memory.manager import MemoryManager
+
     mm = MemoryManager(memory_dir=memory_dir, db_path=db_path)
     mm.sync()
 
@@ -11,12 +11,8 @@ import pytest
 from src.skills.loader import discover_skills, format_skills_list, get_skill_content
 
 
-@pytest.fixture
-def skills_env(tmp_path: Path):
-    """Set up a temporary skills directory with sample skills."""
-    skills_dir = tmp_path / "skills"
-    skills_dir.mkdir()
-
+def _populate_skills(skills_dir: Path) -> None:
+    """Create the sample weather and notes skills under skills_dir."""
     # Create a weather skill
     weather_dir = skills_dir / "weather"
     weather_dir.mkdir()
@@ -44,6 +40,22 @@ def skills_env(tmp_path: Path):
         'Write notes to a file.\n'
     )
 
+
+@pytest.fixture(scope="module")
+def skills_env(tmp_path_factory: pytest.TempPathFactory):
+    """Shared skills directory; only read-only tests use this one."""
+    skills_dir = tmp_path_factory.mktemp("skills_env") / "skills"
+    skills_dir.mkdir()
+    _populate_skills(skills_dir)
+    return skills_dir
+
+
+@pytest.fixture
+def mutable_skills_env(tmp_path: Path):
+    """Fresh per-test copy for tests that add or change skills."""
+    skills_dir = tmp_path / "skills"
+    skills_dir.mkdir()
+    _populate_skills(skills_dir)
     return skills_dir
 
 
@@ -81,12 +93,12 @@ def test_nonexistent_skill_returns_none(skills_env):
     assert get_skill_content(skills, "nonexistent") is None
 
 
-def test_new_skill_discovered_on_rescan(skills_env):
-    skills = discover_skills(skills_env)
+def test_new_skill_discovered_on_rescan(mutable_skills_env):
+    skills = discover_skills(mutable_skills_env)
     assert len(skills) == 2
 
     # Add a new skill
-    new_dir = skills_env / "timer"
+    new_dir = mutable_skills_env / "timer"
     new_dir.mkdir()
     (new_dir / "SKILL.md").write_text(
         '---\n'
@@ -98,7 +110,7 @@ def test_new_skill_discovered_on_rescan(skills_env):
     )
 
     # Re-scan
-    skills = discover_skills(skills_env)
+    skills = discover_skills(mutable_skills_env)
     assert len(skills) == 3
     names = {s.name for s in skills}
     assert "timer" in names